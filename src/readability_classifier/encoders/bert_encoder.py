@@ -2,7 +2,7 @@ import logging
 import re
 
 import torch
-from transformers import BertTokenizer
+from transformers import BertTokenizerFast
 
 from src.readability_classifier.encoders.dataset_utils import (
     EncoderInterface,
@@ -10,7 +10,6 @@ from src.readability_classifier.encoders.dataset_utils import (
 )
 
 DEFAULT_TOKEN_LENGTH = 100  # Maximum length of tokens for BERT
-DEFAULT_ENCODE_BATCH_SIZE = 500  # Number of samples to encode at once
 NEWLINE_TOKEN = "[NL]"  # Special token for new lines
 DEFAULT_OWN_SEGMENT_IDS = False  # Whether to use own segment ids or not
 
@@ -26,6 +25,7 @@ class BertEncoder(EncoderInterface):
         Initializes the DatasetEncoder.
         """
         self.token_length = token_length
+        self._tokenizers: dict[bool, BertTokenizerFast] = {}
 
     def encode_dataset(
         self,
@@ -39,12 +39,7 @@ class BertEncoder(EncoderInterface):
         :param own_segment_ids: Whether to use own segment ids or not.
         :return: The encoded dataset.
         """
-        # Load the BERT tokenizer
-        tokenizer = BertTokenizer.from_pretrained("bert-base-cased")
-
-        # Add a special token "NEWLINE" to the vocabulary
-        if own_segment_ids:
-            tokenizer.add_tokens(NEWLINE_TOKEN)
+        tokenizer = self._get_tokenizer(own_segment_ids)
 
         # Split identifiers in code snippets
         for sample in unencoded_dataset:
@@ -56,23 +51,11 @@ class BertEncoder(EncoderInterface):
                     sample["code_snippet"], NEWLINE_TOKEN
                 )
 
-        # Convert data to batches
-        batches = [
-            unencoded_dataset[i : i + DEFAULT_ENCODE_BATCH_SIZE]
-            for i in range(0, len(unencoded_dataset), DEFAULT_ENCODE_BATCH_SIZE)
-        ]
-
-        # Log the number of batches to encode
-        logging.info(f"Bert: Number of batches to encode: {len(batches)}")
+        # Log the number of code snippets to encode
+        logging.info(f"Bert: Number of snippets to encode: {len(unencoded_dataset)}")
 
-        # Encode the batches
-        encoded_batches = []
-        for batch in batches:
-            logging.info(f"Encoding batch: {len(encoded_batches) + 1}/{len(batches)}")
-            encoded_batches.append(self._encode_batch(batch, tokenizer))
-
-        # Flatten the encoded batches
-        encoded_dataset = [sample for batch in encoded_batches for sample in batch]
+        # Encode all code snippets at once (the fast tokenizer works in parallel)
+        encoded_dataset = self._encode_batch(unencoded_dataset, tokenizer)
 
         # Calculate segment ids
         if own_segment_ids:
@@ -102,11 +85,10 @@ class BertEncoder(EncoderInterface):
         :param own_segment_ids: Whether to use own segment ids or not.
         :return: A dictionary containing the encoded input_ids and attention_mask.
         """
-        tokenizer = BertTokenizer.from_pretrained("bert-base-cased")
+        tokenizer = self._get_tokenizer(own_segment_ids)
 
-        # Add a special token "NEWLINE" to the vocabulary
+        # Add a special token "NEWLINE" to the text
         if own_segment_ids:
-            tokenizer.add_tokens(NEWLINE_TOKEN)
             text = _add_separators(text, NEWLINE_TOKEN)
 
         # Tokenize the text
@@ -135,7 +117,27 @@ class BertEncoder(EncoderInterface):
 
         return encoding
 
-    def _encode_batch(self, batch: list[dict], tokenizer: BertTokenizer) -> list[dict]:
+    def _get_tokenizer(self, own_segment_ids: bool) -> BertTokenizerFast:
+        """
+        Returns the BERT tokenizer. It is loaded only once and then reused.
+        :param own_segment_ids: Whether to use own segment ids or not.
+        :return: The BERT tokenizer.
+        """
+        if own_segment_ids not in self._tokenizers:
+            # Load the BERT tokenizer
+            tokenizer = BertTokenizerFast.from_pretrained("bert-base-cased")
+
+            # Add a special token "NEWLINE" to the vocabulary
+            if own_segment_ids:
+                tokenizer.add_tokens(NEWLINE_TOKEN)
+
+            self._tokenizers[own_segment_ids] = tokenizer
+
+        return self._tokenizers[own_segment_ids]
+
+    def _encode_batch(
+        self, batch: list[dict], tokenizer: BertTokenizerFast
+    ) -> list[dict]:
         """
         Tokenizes and encodes a batch of code snippets with BERT.
         :param batch: The batch of code snippets.
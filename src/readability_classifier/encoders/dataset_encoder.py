@@ -1,4 +1,6 @@
 import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
 
 import torch
 from torch import Tensor
@@ -21,13 +23,15 @@ class DatasetEncoder(EncoderInterface):
     The output is used by the model.
     """
 
-    def __init__(self):
+    def __init__(self, parallel_images: bool = True):
         """
         Initializes the DatasetEncoder.
+        :param parallel_images: Whether to render the images of a dataset in parallel
+            threads.
         """
         self.matrix_encoder = MatrixEncoder()
         self.bert_encoder = BertEncoder()
-        self.visual_encoder = VisualEncoder()
+        self.visual_encoder = VisualEncoder(parallel=parallel_images)
 
     def encode_text(self, code_text: str) -> ReadabilityDataset:
         """
@@ -46,19 +50,52 @@ class DatasetEncoder(EncoderInterface):
             [{"matrix": matrix["matrix"], "bert": bert, "image": image["image"]}]
         )
 
-    def encode_dataset(self, unencoded_dataset: list[dict]) -> ReadabilityDataset:
+    def encode_dataset(
+        self, unencoded_dataset: list[dict], num_workers: int = 1
+    ) -> ReadabilityDataset:
         """
         Encodes the given dataset as matrices, bert and images.
         :param unencoded_dataset: The unencoded dataset.
+        :param num_workers: The number of processes used to encode the code snippets.
+            If 1, the dataset is encoded in the current process. Otherwise, each process
+            renders its images one after another, so that at most num_workers images
+            are rendered at the same time.
         :return: The encoded dataset.
         """
-        matrix_dataset = self.matrix_encoder.encode_dataset(unencoded_dataset)
-        bert_dataset = self.bert_encoder.encode_dataset(unencoded_dataset)
-        image_dataset = self.visual_encoder.encode_dataset(unencoded_dataset)
+        if num_workers > 1 and len(unencoded_dataset) > num_workers:
+            # Encode equally sized shards in parallel, keeping the order of the samples
+            shard_size = math.ceil(len(unencoded_dataset) / num_workers)
+            shards = [
+                unencoded_dataset[i : i + shard_size]
+                for i in range(0, len(unencoded_dataset), shard_size)
+            ]
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                encoded_shards = list(executor.map(_encode_shard, shards))
+            encoded_dataset = [sample for shard in encoded_shards for sample in shard]
+        else:
+            encoded_dataset = self.encode_snippets(unencoded_dataset)
 
-        # Normalize the scores
+        # Normalize the scores (depends on the whole dataset, so never done per shard)
         scores = [sample["score"] for sample in unencoded_dataset]
         encoded_scores = self._encode_scores_class(scores)
+        for sample, encoded_score in zip(encoded_dataset, encoded_scores, strict=True):
+            sample["score"] = encoded_score
+
+        # Log the number of samples in the encoded dataset
+        logging.info(f"All: Encoding done. Number of samples: {len(encoded_dataset)}")
+
+        return ReadabilityDataset(encoded_dataset)
+
+    def encode_snippets(self, unencoded_dataset: list[dict]) -> list[dict]:
+        """
+        Encodes the code snippets of the given dataset as matrices, bert and images.
+        The scores are not encoded.
+        :param unencoded_dataset: The unencoded dataset (or a slice of it).
+        :return: The encoded code snippets with their names.
+        """
+        matrix_dataset = self.matrix_encoder.encode_dataset(unencoded_dataset)
+        bert_dataset = self.bert_encoder.encode_dataset(unencoded_dataset)
+        image_dataset = self.visual_encoder.encode_dataset(unencoded_dataset)
 
         # Get the names, if they exist
         names = ["" for _ in range(len(matrix_dataset))]
@@ -66,22 +103,18 @@ class DatasetEncoder(EncoderInterface):
             names = [sample["name"] for sample in unencoded_dataset]
 
         # Combine the datasets
-        encoded_dataset = []
+        encoded_snippets = []
         for i in range(len(matrix_dataset)):
-            encoded_dataset.append(
+            encoded_snippets.append(
                 {
                     "name": names[i],
                     "matrix": matrix_dataset[i]["matrix"],
                     "bert": bert_dataset[i],
                     "image": image_dataset[i]["image"],
-                    "score": encoded_scores[i],
                 }
             )
 
-        # Log the number of samples in the encoded dataset
-        logging.info(f"All: Encoding done. Number of samples: {len(encoded_dataset)}")
-
-        return ReadabilityDataset(encoded_dataset)
+        return encoded_snippets
 
     @staticmethod
     def _normalize_scores(
@@ -163,6 +196,16 @@ class DatasetEncoder(EncoderInterface):
         return torch.tensor(scores)
 
 
+def _encode_shard(unencoded_shard: list[dict]) -> list[dict]:
+    """
+    Encodes the code snippets of a shard of a dataset. Used for parallel processing.
+    The images are rendered serially, the shards already run in parallel processes.
+    :param unencoded_shard: The shard of the unencoded dataset.
+    :return: The encoded code snippets of the shard.
+    """
+    return DatasetEncoder(parallel_images=False).encode_snippets(unencoded_shard)
+
+
 def decode_score(score: float) -> tuple[str, float]:
     """
     Decodes the given score to a tuple with class and score.
@@ -1,4 +1,6 @@
+import hashlib
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -10,6 +12,9 @@ from torch.utils.data import DataLoader, Dataset
 
 from src.readability_classifier.utils.config import DEFAULT_MODEL_BATCH_SIZE
 
+# The samples are already encoded, a few workers suffice to load the batches
+MAX_LOADER_WORKERS = 4
+
 
 class ReadabilityDataset(Dataset):
     """
@@ -109,43 +114,41 @@ def load_encoded_dataset(data_dir: str) -> ReadabilityDataset:
     :return: A ReadabilityDataset.
     """
     dataset = load_from_disk(data_dir)
-    dataset_list = dataset.to_list()
-
-    # Convert loaded data to torch.Tensors
-    for sample in dataset_list:
-        sample["matrix"] = torch.tensor(
-            sample["matrix"], dtype=torch.float32
-        )  # Why not int?
-        # TODO: The following 4 should be own dic with 4th optional
-        sample["bert"]["input_ids"] = torch.tensor(
-            sample["bert"]["input_ids"], dtype=torch.long  # Why not int? Why long?
-        )  # Why not int?
-        if "token_type_ids" in sample["bert"]:
-            sample["bert"]["token_type_ids"] = torch.tensor(
-                sample["bert"]["token_type_ids"],
-                dtype=torch.long
-                # Why not int? Why long?
-            )
-        if "attention_mask" in sample["bert"]:
-            sample["bert"]["attention_mask"] = torch.tensor(
-                sample["bert"]["attention_mask"],
-                dtype=torch.long
-                # Why not int? Why long?
-            )
-        if "segment_ids" in sample["bert"]:
-            sample["bert"]["segment_ids"] = torch.tensor(
-                sample["bert"]["segment_ids"],
-                dtype=torch.long
-                # Why not int? Why long?
+    if len(dataset) == 0:
+        logging.info(f"Loaded 0 samples from {data_dir}")
+        return ReadabilityDataset([])
+
+    # Convert each column to one stacked tensor at once instead of every sample on its
+    # own. The samples are row views of these tensors.
+    tensor_columns = {
+        "matrix": torch.tensor(dataset["matrix"], dtype=torch.float32),
+        "image": torch.tensor(dataset["image"], dtype=torch.float32),
+        "score": torch.tensor(dataset["score"], dtype=torch.float32),
+    }
+    bert_rows = dataset["bert"]
+    bert_keys = _present_keys(bert_rows[0])
+    for row in bert_rows:
+        if _present_keys(row) != bert_keys:
+            raise ValueError(
+                f"The encoded samples in {data_dir} have different bert keys: "
+                f"{sorted(bert_keys)} and {sorted(_present_keys(row))}"
             )
-        if "position_ids" in sample["bert"]:
-            sample["bert"]["position_ids"] = torch.tensor(
-                sample["bert"]["position_ids"],
-                dtype=torch.long
-                # Why not int? Why long?
-            )
-        sample["image"] = torch.tensor(sample["image"], dtype=torch.float32)
-        sample["score"] = torch.tensor(sample["score"], dtype=torch.float32)
+    bert_columns = {
+        key: torch.tensor([row[key] for row in bert_rows], dtype=torch.long)
+        for key in bert_keys
+    }
+    other_columns = {
+        column: dataset[column]
+        for column in dataset.column_names
+        if column not in tensor_columns and column != "bert"
+    }
+
+    dataset_list = []
+    for i in range(len(dataset)):
+        sample = {column: values[i] for column, values in other_columns.items()}
+        sample.update({column: values[i] for column, values in tensor_columns.items()})
+        sample["bert"] = {key: values[i] for key, values in bert_columns.items()}
+        dataset_list.append(sample)
 
     # Log the number of samples in the dataset
     logging.info(f"Loaded {len(dataset_list)} samples from {data_dir}")
@@ -153,6 +156,15 @@ def load_encoded_dataset(data_dir: str) -> ReadabilityDataset:
     return ReadabilityDataset(dataset_list)
 
 
+def _present_keys(row: dict) -> set[str]:
+    """
+    Returns the keys of the given row that have a value.
+    :param row: The row of the dataset.
+    :return: The keys whose value is not None.
+    """
+    return {key for key, value in row.items() if value is not None}
+
+
 def store_encoded_dataset(data: ReadabilityDataset, data_dir: str) -> None:
     """
     Stores the encoded data in the given directory.
@@ -167,6 +179,33 @@ def store_encoded_dataset(data: ReadabilityDataset, data_dir: str) -> None:
     logging.info(f"Stored {len(data)} samples in {data_dir}")
 
 
+def dataset_cache_key(
+    data_dir: str, hash_content: bool = True, settings: tuple = ()
+) -> str:
+    """
+    Computes a key identifying the raw dataset in the given directory. Used to cache
+    the encoded dataset.
+    :param data_dir: The path to the directory containing the data.
+    :param hash_content: Whether to hash the file contents. If False, only the file
+        sizes and modification times are used, which is faster for large datasets.
+    :param settings: Encoder settings that change the encoded dataset (e.g. the token
+        length), so that a change of them invalidates the cache.
+    :return: The key as hex string.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(settings).encode())
+    for file in sorted(path for path in Path(data_dir).rglob("*") if path.is_file()):
+        digest.update(str(file.relative_to(data_dir)).encode())
+        if hash_content:
+            with open(file, "rb") as file_stream:
+                for chunk in iter(lambda: file_stream.read(1 << 20), b""):
+                    digest.update(chunk)
+        else:
+            stat = file.stat()
+            digest.update(f"{stat.st_size}-{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
 @dataclass
 class Datasets:
     """
@@ -242,16 +281,37 @@ def split_train_val(
 
 
 def dataset_to_dataloader(
-    dataset: ReadabilityDataset, batch_size: int = DEFAULT_MODEL_BATCH_SIZE
+    dataset: ReadabilityDataset,
+    batch_size: int = DEFAULT_MODEL_BATCH_SIZE,
+    persistent_workers: bool = True,
 ) -> DataLoader:
     """
     Converts a readability dataset to a data loader.
     :param dataset: The dataset.
     :param batch_size: The batch size.
+    :param persistent_workers: Whether to keep the worker processes alive between
+        epochs. The workers are only shut down when the data loader is garbage
+        collected, so disable this for short-lived data loaders (e.g. of a k-fold).
     :return: The data loader.
     """
+    # Load batches in background workers into pinned memory, so that the transfer to
+    # the GPU can be done asynchronously
+    num_workers = min(MAX_LOADER_WORKERS, (os.cpu_count() or 0) // 2)
+    worker_kwargs = (
+        {"persistent_workers": persistent_workers, "prefetch_factor": 4}
+        if num_workers > 0
+        else {}
+    )
+
     # Create data loaders for training, validation, and test sets
-    loader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
+    loader = DataLoader(
+        dataset,
+        batch_size=batch_size,
+        shuffle=True,
+        pin_memory=torch.cuda.is_available(),
+        num_workers=num_workers,
+        **worker_kwargs,
+    )
 
     # Log the number of samples in the training, validation, and test data
     logging.info(f"Training data: {len(dataset)} samples")
@@ -25,6 +25,13 @@ class VisualEncoder(EncoderInterface):
     A class for encoding code snippets as images.
     """
 
+    def __init__(self, parallel: bool = True):
+        """
+        Initializes the VisualEncoder.
+        :param parallel: Whether to render the images of a dataset in parallel threads.
+        """
+        self.parallel = parallel
+
     def encode_dataset(self, unencoded_dataset: list[dict]) -> ReadabilityDataset:
         """
         Encodes the given dataset as images.
@@ -40,7 +47,9 @@ class VisualEncoder(EncoderInterface):
         logging.info(f"Image: Number of code snippets to encode: {len(code_snippets)}")
 
         # Encode the code snippets
-        encoded_code_snippets = dataset_to_image_tensors(code_snippets)
+        encoded_code_snippets = dataset_to_image_tensors(
+            code_snippets, parallel=self.parallel
+        )
 
         # Convert the list of encoded code snippets to a ReadabilityDataset
         for i in range(len(encoded_code_snippets)):
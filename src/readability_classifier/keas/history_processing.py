@@ -208,18 +208,30 @@ class OverallStats:
         Get the average over all folds.
         :return: The average over all folds.
         """
-        best_folds = []
-        for fold in self.fold_stats:
-            best_folds.append(fold.get_best())
+        best_folds = [fold.get_best() for fold in self.fold_stats]
+
+        # One row per metric, so that each mean is a reduction over a contiguous row
+        metrics = np.array(
+            [
+                [fold.acc for fold in best_folds],
+                [fold.precision for fold in best_folds],
+                [fold.recall for fold in best_folds],
+                [fold.auc for fold in best_folds],
+                [fold.f1 for fold in best_folds],
+                [fold.mcc for fold in best_folds],
+            ],
+            dtype=np.float64,
+        )
+        acc, precision, recall, auc, f1, mcc = metrics.mean(axis=1)
 
         return Stats(
             epoch=None,
-            acc=np.mean([fold.acc for fold in best_folds]),
-            precision=np.mean([fold.precision for fold in best_folds]),
-            recall=np.mean([fold.recall for fold in best_folds]),
-            auc=np.mean([fold.auc for fold in best_folds]),
-            f1=np.mean([fold.f1 for fold in best_folds]),
-            mcc=np.mean([fold.mcc for fold in best_folds]),
+            acc=acc,
+            precision=precision,
+            recall=recall,
+            auc=auc,
+            f1=f1,
+            mcc=mcc,
         )
 
 
@@ -1,10 +1,9 @@
-import json
 import logging
 import pickle
-from dataclasses import asdict
 from pathlib import Path
 
 import keras.models
+import tensorflow as tf
 from keras.src.saving import custom_object_scope
 
 from src.readability_classifier.encoders.dataset_encoder import decode_score
@@ -16,6 +15,7 @@ from src.readability_classifier.keas.classifier import (
 )
 from src.readability_classifier.keas.history_processing import HistoryProcessor
 from src.readability_classifier.keas.model import BertEmbedding, create_towards_model
+from src.readability_classifier.utils.utils import save_content_to_file, stats_to_json
 
 STATS_FILE_NAME = "stats.json"
 
@@ -54,8 +54,15 @@ class KerasModelRunner(ModelRunnerInterface):
         fine_tune = parsed_args.fine_tune
         layer_names_to_freeze = parsed_args.freeze
 
-        # Build the model
-        towards_model = create_towards_model(learning_rate=learning_rate)
+        # Build the model on all local GPUs and scale the batch size and learning
+        # rate with the number of replicas (linear scaling rule)
+        strategy = tf.distribute.MirroredStrategy()
+        num_replicas = strategy.num_replicas_in_sync
+        batch_size *= num_replicas
+        learning_rate *= num_replicas
+        logging.info(f"Training on {num_replicas} replica(s)")
+        with strategy.scope():
+            towards_model = create_towards_model(learning_rate=learning_rate)
 
         # Load the pretrained model if available
         if fine_tune is not None:
@@ -94,8 +101,7 @@ class KerasModelRunner(ModelRunnerInterface):
 
         # Store the stats
         store_path = Path(store_dir) / STATS_FILE_NAME
-        with open(store_path, "w") as file:
-            json.dump(asdict(processed_history), file, indent=4)
+        save_content_to_file(stats_to_json(processed_history), store_path)
 
     def run_predict(
         self, parsed_args, encoded_data: ReadabilityDataset
@@ -158,5 +164,4 @@ class KerasModelRunner(ModelRunnerInterface):
 
         # Store the stats
         store_path = Path(store_dir) / STATS_FILE_NAME
-        with open(store_path, "w") as file:
-            json.dump(asdict(processed_history), file, indent=4)
+        save_content_to_file(stats_to_json(processed_history), store_path)
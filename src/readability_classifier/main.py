@@ -3,25 +3,18 @@ import os
 import random
 import sys
 from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from pathlib import Path
-from typing import Any, AnyStr
-
-from src.readability_classifier.encoders.dataset_encoder import (
-    DatasetEncoder,
-    decode_score,
-)
-from src.readability_classifier.encoders.dataset_utils import (
-    load_encoded_dataset,
-    load_raw_dataset,
-    store_encoded_dataset,
-)
-from src.readability_classifier.keas.model_runner import KerasModelRunner
-from src.readability_classifier.toch.model_buider import Model
-from src.readability_classifier.toch.model_runner import (
-    ModelRunnerInterface,
-    TorchModelRunner,
-)
+from typing import TYPE_CHECKING, Any, AnyStr
+
+from src.readability_classifier.toch.model_type import Model
+
+# The encoders and model runners import torch, tensorflow and transformers. They are
+# imported where they are needed, to keep the startup of the CLI fast.
+if TYPE_CHECKING:
+    from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
+    from src.readability_classifier.toch.model_runner import ModelRunnerInterface
 
 DEFAULT_LOG_FILE_NAME = "readability-classifier"
 DEFAULT_LOG_FILE = f"{DEFAULT_LOG_FILE_NAME}.log"
@@ -30,6 +23,12 @@ CURR_DIR = os.path.dirname(os.path.realpath(__file__))
 DEFAULT_SAVE_DIR = os.path.join(CURR_DIR, "../../models")
 KERAS = True
 SEED = 42
+DEFAULT_MODEL = "TOWARDS"
+# Each encoding process renders one image at a time with an external renderer, so the
+# number of processes is capped independently of the number of cores
+DEFAULT_ENCODE_WORKERS = min(8, os.cpu_count() or 1)
+# File next to an encoded dataset with the key of the raw dataset it was encoded from
+CACHE_KEY_FILE = "cache_key.txt"
 
 
 def _setup_logging(log_file: str = DEFAULT_LOG_FILE, overwrite: bool = False) -> None:
@@ -52,7 +51,6 @@ def _setup_logging(log_file: str = DEFAULT_LOG_FILE, overwrite: bool = False) ->
 
     # Set the logging level
     logging_level = logging.INFO
-    logging.basicConfig(level=logging_level)
 
     # Create a file handler to write messages to a log file
     file_handler = logging.FileHandler(log_file, mode=mode)
@@ -69,8 +67,12 @@ def _setup_logging(log_file: str = DEFAULT_LOG_FILE, overwrite: bool = False) ->
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
 
-    # Get the root logger and add the handlers
+    # Get the root logger and replace the handlers of previous setups
     logger = logging.getLogger("")
+    logger.setLevel(logging_level)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
     logger.addHandler(file_handler)
     logger.addHandler(console_handler)
 
@@ -131,6 +133,13 @@ def _set_up_arg_parser() -> ArgumentParser:
         "the log file is stored in the current directory.",
         default=DEFAULT_SAVE_DIR,
     )
+    encode_parser.add_argument(
+        "--encode-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_ENCODE_WORKERS,
+        help="The number of processes used to encode the dataset.",
+    )
 
     # Parser for the training task
     train_parser = sub_parser.add_parser(str(Tasks.TRAIN))
@@ -138,9 +147,10 @@ def _set_up_arg_parser() -> ArgumentParser:
         "--model",
         "-m",
         required=False,
-        type=Model,
+        type=str.upper,
+        choices=[model.name for model in Model],
         help="The model to use.",
-        default=Model.TOWARDS,
+        default=DEFAULT_MODEL,
     )
     train_parser.add_argument(
         "--input",
@@ -169,8 +179,10 @@ def _set_up_arg_parser() -> ArgumentParser:
         "--intermediate",
         required=False,
         type=Path,
-        help="Path to the folder where intermediate results should be stored. "
-        "If not specified, the intermediate results are not stored.",
+        help="Path to the folder where the encoded dataset should be stored. It can be "
+        "loaded with --encoded by later runs. If the folder already contains the "
+        "encoded dataset of the same raw dataset, it is loaded instead of encoding the "
+        "raw dataset again. If not specified, the encoded dataset is not stored.",
     )
     train_parser.add_argument(
         "--evaluate",
@@ -211,6 +223,14 @@ def _set_up_arg_parser() -> ArgumentParser:
         default=0.0015,
         help="The learning rate for training.",
     )
+    train_parser.add_argument(
+        "--checkpoint-every",
+        required=False,
+        type=int,
+        default=0,
+        help="Store the model every k epochs in addition to the best and the final "
+        "model. If not specified, no periodic checkpoints are stored.",
+    )
     train_parser.add_argument(
         "--fine-tune",
         required=False,
@@ -227,6 +247,13 @@ def _set_up_arg_parser() -> ArgumentParser:
         type=str,
         help="The layer names to freeze.",
     )
+    train_parser.add_argument(
+        "--encode-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_ENCODE_WORKERS,
+        help="The number of processes used to encode the dataset.",
+    )
 
     # Parser for the evaluation task
     evaluate_parser = sub_parser.add_parser(str(Tasks.EVALUATE))
@@ -263,9 +290,10 @@ def _set_up_arg_parser() -> ArgumentParser:
         "--model",
         "-m",
         required=False,
-        type=Model,
+        type=str.upper,
+        choices=[model.name for model in Model],
         help="The type of the model used.",
-        default=Model.TOWARDS,
+        default=DEFAULT_MODEL,
     )
     evaluate_parser.add_argument(
         "--batch-size",
@@ -290,6 +318,13 @@ def _set_up_arg_parser() -> ArgumentParser:
         action="store_true",
         help="Whether the model should be evaluated on a single part only.",
     )
+    evaluate_parser.add_argument(
+        "--encode-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_ENCODE_WORKERS,
+        help="The number of processes used to encode the dataset.",
+    )
 
     # Parser for the prediction task
     predict_parser = sub_parser.add_parser(str(Tasks.PREDICT))
@@ -307,12 +342,19 @@ def _set_up_arg_parser() -> ArgumentParser:
     return arg_parser
 
 
-def _run_encode(parsed_args) -> None:
+def _run_encode(parsed_args, model_runner: "ModelRunnerInterface" = None) -> None:
     """
     Runs the encoding of the dataset.
     :param parsed_args: Parsed arguments.
+    :param model_runner: Not used, the encoding does not depend on the model.
     :return: None
     """
+    from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
+    from src.readability_classifier.encoders.dataset_utils import (
+        load_raw_dataset,
+        store_encoded_dataset,
+    )
+
     # Get the parsed arguments
     data_dir = parsed_args.input
     intermediate_dir = parsed_args.intermediate
@@ -321,20 +363,71 @@ def _run_encode(parsed_args) -> None:
     raw_data = load_raw_dataset(data_dir)
 
     # Encode the dataset
-    encoded_data = DatasetEncoder().encode_dataset(raw_data)
+    encoded_data = DatasetEncoder().encode_dataset(
+        raw_data, num_workers=parsed_args.encode_workers
+    )
 
     # Store the encoded dataset
     if intermediate_dir:
         store_encoded_dataset(encoded_data, intermediate_dir)
 
 
-def _run_train(parsed_args, model_runner: ModelRunnerInterface) -> None:
+def _load_or_encode(
+    data_dir: Path,
+    intermediate_dir: Path = None,
+    num_workers: int = DEFAULT_ENCODE_WORKERS,
+) -> "ReadabilityDataset":
+    """
+    Encodes the raw dataset. If an intermediate directory is given, the encoded
+    dataset is stored there (loadable with --encoded) together with a key of the raw
+    dataset. Later runs on the same raw dataset load the stored encoded dataset
+    instead of encoding it again.
+    :param data_dir: Path to the raw dataset.
+    :param intermediate_dir: Path to the folder for intermediate results.
+    :param num_workers: The number of processes used to encode the dataset.
+    :return: The encoded dataset.
+    """
+    from src.readability_classifier.encoders.bert_encoder import (
+        DEFAULT_OWN_SEGMENT_IDS,
+        DEFAULT_TOKEN_LENGTH,
+    )
+    from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
+    from src.readability_classifier.encoders.dataset_utils import (
+        dataset_cache_key,
+        load_encoded_dataset,
+        load_raw_dataset,
+        store_encoded_dataset,
+    )
+
+    key = None
+    if intermediate_dir:
+        key = dataset_cache_key(
+            data_dir, settings=(DEFAULT_TOKEN_LENGTH, DEFAULT_OWN_SEGMENT_IDS)
+        )
+        key_file = Path(intermediate_dir) / CACHE_KEY_FILE
+        if key_file.is_file() and key_file.read_text() == key:
+            logging.info(f"Loading cached encoded dataset from {intermediate_dir}")
+            return load_encoded_dataset(str(intermediate_dir))
+
+    raw_data = load_raw_dataset(data_dir)
+    encoded_data = DatasetEncoder().encode_dataset(raw_data, num_workers=num_workers)
+
+    if intermediate_dir:
+        store_encoded_dataset(encoded_data, str(intermediate_dir))
+        (Path(intermediate_dir) / CACHE_KEY_FILE).write_text(key)
+
+    return encoded_data
+
+
+def _run_train(parsed_args, model_runner: "ModelRunnerInterface") -> None:
     """
     Runs the training of the readability classifier.
     :param parsed_args: Parsed arguments.
     :param model_runner: The model runner.
     :return: None
     """
+    from src.readability_classifier.encoders.dataset_utils import load_encoded_dataset
+
     # Get the parsed arguments
     data_dir = parsed_args.input
     encoded = parsed_args.encoded
@@ -351,11 +444,9 @@ def _run_train(parsed_args, model_runner: ModelRunnerInterface) -> None:
 
     # Load the dataset
     if not encoded:
-        raw_data = load_raw_dataset(data_dir)
-        encoded_data = DatasetEncoder().encode_dataset(raw_data)
-
-        if intermediate_dir:
-            store_encoded_dataset(encoded_data, intermediate_dir)
+        encoded_data = _load_or_encode(
+            data_dir, intermediate_dir, num_workers=parsed_args.encode_workers
+        )
     else:
         encoded_data = load_encoded_dataset(data_dir)
 
@@ -363,12 +454,40 @@ def _run_train(parsed_args, model_runner: ModelRunnerInterface) -> None:
     model_runner.run_train(parsed_args, encoded_data)
 
 
-def _run_predict(parsed_args, model_runner: ModelRunnerInterface) -> tuple[str, float]:
+def _read_java_files(directory: str) -> list[str]:
+    """
+    Reads the content of all java files in the given directory. The files are read in
+    parallel to overlap the file IO.
+    :param directory: The directory containing the java files.
+    :return: The contents of the java files.
+    """
+    with os.scandir(directory) as entries:
+        files = [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_file() and entry.name.endswith(".java")
+        ]
+
+    if not files:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(32, len(files))) as executor:
+        return list(executor.map(Path.read_text, files))
+
+
+def _run_predict(
+    parsed_args, model_runner: "ModelRunnerInterface"
+) -> tuple[str, float]:
     """
     Runs the prediction of the readability classifier.
     :param parsed_args: Parsed arguments.
     :return: None
     """
+    from src.readability_classifier.encoders.dataset_encoder import (
+        DatasetEncoder,
+        decode_score,
+    )
+
     data_arg = parsed_args.input
     data_inputs: list[AnyStr] = []
 
@@ -378,11 +497,7 @@ def _run_predict(parsed_args, model_runner: ModelRunnerInterface) -> tuple[str,
             data_inputs.append(file.read())
     else:
         if os.path.isdir(data_arg):
-            for name in os.listdir(data_arg):
-                f = os.path.join(data_arg, name)
-                if os.path.isfile(f) and f.endswith(".java"):
-                    with open(f) as file:
-                        data_inputs.append(file.read())
+            data_inputs.extend(_read_java_files(data_arg))
         else:
             raise FileNotFoundError(f"{data_arg} does not exist.")
 
@@ -405,12 +520,18 @@ def _run_predict(parsed_args, model_runner: ModelRunnerInterface) -> tuple[str,
     return prediction
 
 
-def _run_evaluate(parsed_args, model_runner: ModelRunnerInterface) -> None:
+def _run_evaluate(parsed_args, model_runner: "ModelRunnerInterface") -> None:
     """
     Runs the evaluation of the readability classifier.
     :param parsed_args: Parsed arguments.
     :return: None
     """
+    from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
+    from src.readability_classifier.encoders.dataset_utils import (
+        load_encoded_dataset,
+        load_raw_dataset,
+    )
+
     data_dir = parsed_args.input
     encoded = parsed_args.encoded
     parts = parsed_args.parts
@@ -419,7 +540,9 @@ def _run_evaluate(parsed_args, model_runner: ModelRunnerInterface) -> None:
     # Load the dataset
     if not encoded:
         raw_data = load_raw_dataset(data_dir)
-        encoded_data = DatasetEncoder().encode_dataset(raw_data)
+        encoded_data = DatasetEncoder().encode_dataset(
+            raw_data, num_workers=parsed_args.encode_workers
+        )
     else:
         encoded_data = load_encoded_dataset(data_dir)
 
@@ -435,6 +558,29 @@ def _run_evaluate(parsed_args, model_runner: ModelRunnerInterface) -> None:
             model_runner.run_evaluate(parsed_args, part)
 
 
+def _create_model_runner() -> "ModelRunnerInterface":
+    """
+    Creates the model runner for the configured framework.
+    :return: The model runner.
+    """
+    if KERAS:
+        from src.readability_classifier.keas.model_runner import KerasModelRunner
+
+        return KerasModelRunner()
+
+    from src.readability_classifier.toch.model_runner import TorchModelRunner
+
+    return TorchModelRunner()
+
+
+TASK_RUNNERS = {
+    Tasks.ENCODE: _run_encode,
+    Tasks.TRAIN: _run_train,
+    Tasks.PREDICT: _run_predict,
+    Tasks.EVALUATE: _run_evaluate,
+}
+
+
 def main(args: list[str]) -> int:
     """
     Main function of the readability classifier.
@@ -448,9 +594,8 @@ def main(args: list[str]) -> int:
     # Set up logging and specify logfile name
     logfile = DEFAULT_LOG_FILE
     if hasattr(parsed_args, "save") and parsed_args.save:
-        folder_path = Path(parsed_args.save)
-        folder_name = Path(parsed_args.save).name
-        logfile = folder_path / Path(f"{DEFAULT_LOG_FILE_NAME}-{folder_name}.log")
+        save_path = Path(parsed_args.save)
+        logfile = save_path / f"{DEFAULT_LOG_FILE_NAME}-{save_path.name}.log"
 
     try:
         _setup_logging(logfile, overwrite=True)
@@ -464,19 +609,11 @@ def main(args: list[str]) -> int:
     # Set the seed
     random.seed(SEED)
 
-    # Set up the model runner
-    model_runner = KerasModelRunner() if KERAS else TorchModelRunner()
+    # Set up the model runner (not needed for encoding)
+    model_runner = None if task == Tasks.ENCODE else _create_model_runner()
 
     # Execute the task
-    match task:
-        case Tasks.ENCODE:
-            _run_encode(parsed_args)
-        case Tasks.TRAIN:
-            _run_train(parsed_args, model_runner)
-        case Tasks.PREDICT:
-            _run_predict(parsed_args, model_runner)
-        case Tasks.EVALUATE:
-            _run_evaluate(parsed_args, model_runner)
+    TASK_RUNNERS[task](parsed_args, model_runner)
     return 0
 
 
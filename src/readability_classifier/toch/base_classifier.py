@@ -1,9 +1,12 @@
-import json
+import io
 import logging
-import math
+import os
 from abc import ABC, abstractmethod
-from dataclasses import asdict, dataclass
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from copy import deepcopy
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from operator import attrgetter, itemgetter
 from pathlib import Path
 from time import time
 
@@ -11,10 +14,8 @@ import numpy as np
 import torch
 from sklearn.metrics import (
     accuracy_score,
-    f1_score,
     matthews_corrcoef,
-    precision_score,
-    recall_score,
+    precision_recall_fscore_support,
     roc_auc_score,
 )
 from torch import Tensor, nn
@@ -27,7 +28,19 @@ from src.readability_classifier.encoders.dataset_utils import (
     split_k_fold,
 )
 from src.readability_classifier.utils.config import DEFAULT_MODEL_BATCH_SIZE, ModelInput
-from src.readability_classifier.utils.utils import save_content_to_file
+from src.readability_classifier.utils.utils import (
+    save_content_to_file,
+    stats_to_json,
+)
+
+# Evaluation metrics and their reductions over the k folds
+_METRICS = ("accuracy", "precision", "recall", "f1", "auc", "mcc")
+_REDUCTIONS = ("max", "min", "mean", "std")
+_get_metrics = attrgetter(*_METRICS)
+
+# Getters for the encoded parts of a batch, called once per batch
+_get_encodings = itemgetter("matrix", "bert", "image")
+_get_bert_encodings = itemgetter("input_ids", "token_type_ids", "attention_mask")
 
 
 @dataclass(frozen=True, eq=True)
@@ -45,7 +58,7 @@ class EpochStats:
         Convert to json.
         :return: Returns the json string.
         """
-        return json.dumps(asdict(self))
+        return stats_to_json(self)
 
 
 @dataclass(eq=True)
@@ -56,8 +69,8 @@ class TrainStats:
 
     best_epoch: int
     epoch_stats: list[EpochStats]
-    start_time: int = int(time())
-    end_time: int = int(time())
+    start_time: int = field(default_factory=lambda: int(time()))
+    end_time: int = field(default_factory=lambda: int(time()))
 
     def to_json(self) -> str:
         """
@@ -66,7 +79,7 @@ class TrainStats:
         """
         # Update end time every time when stats are saved
         self.end_time = int(time())
-        return json.dumps(asdict(self))
+        return stats_to_json(self)
 
 
 @dataclass(frozen=True, eq=True)
@@ -88,7 +101,7 @@ class EvaluationStats:
         Convert to json.
         :return: Returns the json string.
         """
-        return json.dumps(asdict(self))
+        return stats_to_json(self)
 
 
 @dataclass
@@ -138,43 +151,43 @@ class KFoldStats:
         """
         self.fold_stats = fold_stats
 
-        # Calculate the max, min, mean and std of the evaluation metrics
-        self.max_accuracy = max([stats.accuracy for stats in fold_stats])
-        self.min_accuracy = min([stats.accuracy for stats in fold_stats])
-        self.mean_accuracy = np.mean([stats.accuracy for stats in fold_stats])
-        self.std_accuracy = np.std([stats.accuracy for stats in fold_stats])
-
-        self.max_precision = max([stats.precision for stats in fold_stats])
-        self.min_precision = min([stats.precision for stats in fold_stats])
-        self.mean_precision = np.mean([stats.precision for stats in fold_stats])
-        self.std_precision = np.std([stats.precision for stats in fold_stats])
-
-        self.max_recall = max([stats.recall for stats in fold_stats])
-        self.min_recall = min([stats.recall for stats in fold_stats])
-        self.mean_recall = np.mean([stats.recall for stats in fold_stats])
-        self.std_recall = np.std([stats.recall for stats in fold_stats])
-
-        self.max_f1 = max([stats.f1 for stats in fold_stats])
-        self.min_f1 = min([stats.f1 for stats in fold_stats])
-        self.mean_f1 = np.mean([stats.f1 for stats in fold_stats])
-        self.std_f1 = np.std([stats.f1 for stats in fold_stats])
-
-        self.max_auc = max([stats.auc for stats in fold_stats])
-        self.min_auc = min([stats.auc for stats in fold_stats])
-        self.mean_auc = np.mean([stats.auc for stats in fold_stats])
-        self.std_auc = np.std([stats.auc for stats in fold_stats])
-
-        self.max_mcc = max([stats.mcc for stats in fold_stats])
-        self.min_mcc = min([stats.mcc for stats in fold_stats])
-        self.mean_mcc = np.mean([stats.mcc for stats in fold_stats])
-        self.std_mcc = np.std([stats.mcc for stats in fold_stats])
+        # Collect the evaluation metrics of all folds in one (k, 6) array
+        metrics = np.array(
+            [_get_metrics(stats) for stats in fold_stats], dtype=np.float64
+        )
+
+        # Calculate the max, min, mean and std of the evaluation metrics as (4, 6) array
+        stats = np.stack(
+            [
+                metrics.max(axis=0),
+                metrics.min(axis=0),
+                metrics.mean(axis=0),
+                metrics.std(axis=0),
+            ]
+        )
+        for name, value in self._stats_items(stats):
+            setattr(self, name, value)
+
+    @staticmethod
+    def _stats_items(stats: np.ndarray) -> list[tuple[str, float]]:
+        """
+        Returns the names and values of the max, min, mean and std of the evaluation
+        metrics in field order (e.g. max_accuracy, min_accuracy, ...).
+        :param stats: The max, min, mean and std of the metrics as (4, 6) array.
+        :return: The names and values.
+        """
+        return [
+            (f"{reduction}_{metric}", value)
+            for metric, values in zip(_METRICS, stats.T.tolist())
+            for reduction, value in zip(_REDUCTIONS, values)
+        ]
 
     def to_json(self) -> str:
         """
         Convert to json.
         :return: Returns the json string.
         """
-        return json.dumps(asdict(self))
+        return stats_to_json(asdict(self))
 
 
 class BaseClassifier(ABC):
@@ -192,6 +205,7 @@ class BaseClassifier(ABC):
         batch_size: int = DEFAULT_MODEL_BATCH_SIZE,
         num_epochs: int = 20,
         learning_rate: float = 0.0015,
+        checkpoint_every: int = 0,
     ):
         """
         Initializes the classifier.
@@ -206,11 +220,20 @@ class BaseClassifier(ABC):
         :param batch_size: The batch size.
         :param num_epochs: The number of epochs.
         :param learning_rate: The learning rate.
+        :param checkpoint_every: Store the model every k epochs. 0 to disable.
         """
+        # All inputs are encoded to fixed shapes (matrix, token length, image size), so
+        # cuDNN only autotunes for the full and the (smaller) last batch
+        if torch.cuda.is_available():
+            torch.backends.cudnn.benchmark = True
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+            torch.set_float32_matmul_precision("high")
+
         self.model = model
         self.criterion = criterion
         self.optimizer = optimizer
-        self.initial_optimizer_state_dict = optimizer.state_dict()
+        self.initial_optimizer_state_dict = deepcopy(optimizer.state_dict())
         self.train_dataset = train_dataset
         self.test_dataset = test_dataset
         self.train_loader = train_loader
@@ -220,10 +243,107 @@ class BaseClassifier(ABC):
         self.batch_size = batch_size
         self.num_epochs = num_epochs
         self.learning_rate = learning_rate
+        self.checkpoint_every = checkpoint_every
+
+        # Encoder for predictions
+        self._encoder = DatasetEncoder()
+
+        # Checkpoints are written to disk by a background worker
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        self._pending: list[Future] = []
 
         # Move model to device
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model.to(self.device)
+        self.model.to(self.device, memory_format=torch.channels_last)
+
+        # Mixed precision on the GPU: bf16 if supported, otherwise fp16 with scaling
+        self.use_amp = self.device.type == "cuda"
+        self.amp_dtype = (
+            torch.bfloat16
+            if self.use_amp and torch.cuda.is_bf16_supported()
+            else torch.float16
+        )
+        self.scaler = torch.cuda.amp.GradScaler(
+            enabled=self.use_amp and self.amp_dtype == torch.float16
+        )
+
+        # Compile the model
+        self._compile_model()
+
+    def _compile_model(self) -> None:
+        """
+        Compiles the model with torch.compile, unless RC_NO_COMPILE=1 is set.
+        The uncompiled model is kept to store and load the state dict without the
+        prefixes added by the compiled wrapper.
+        torch.compile is lazy: the model is compiled on the first forward pass. If the
+        compilation fails there, the model falls back to eager mode (see _forward).
+        :return: None
+        """
+        self._raw_model = self.model
+        if hasattr(torch, "compile") and os.environ.get("RC_NO_COMPILE") != "1":
+            try:
+                self.model = torch.compile(
+                    self.model, mode="reduce-overhead", dynamic=False
+                )
+            except RuntimeError as e:
+                # E.g. torch.compile is not supported on this platform
+                logging.warning(f"Could not compile the model, using eager mode: {e}")
+
+    def _forward(self, x: ModelInput) -> Tensor:
+        """
+        Runs the forward pass of the model. If the compilation of the model fails (e.g.
+        no C compiler for the inductor backend), a warning is logged and the model is
+        run in eager mode from then on.
+        :param x: The input of the model.
+        :return: The output of the model.
+        """
+        if self.model is self._raw_model:
+            return self.model(x)
+
+        try:
+            return self.model(x)
+        except torch._dynamo.exc.TorchDynamoException as e:
+            logging.warning(f"Could not compile the model, using eager mode: {e}")
+            self.model = self._raw_model
+            return self.model(x)
+
+    def _reset_model(self) -> None:
+        """
+        Resets the model to a freshly initialized state. The weights of a newly built
+        model are copied into the existing model in place, so that the compiled model is
+        reused instead of compiled again. Layers whose size was adapted to the input
+        (see FullyConnectedModel.update_input_length) are reinitialized in place.
+        :return: None
+        """
+        fresh_state = self._raw_model.__class__.build_from_config().state_dict()
+        state = self._raw_model.state_dict()
+
+        resized_keys = set()
+        for key in list(fresh_state):
+            if key in state and fresh_state[key].shape != state[key].shape:
+                module_name = key.rsplit(".", 1)[0]
+                self._raw_model.get_submodule(module_name).reset_parameters()
+                del fresh_state[key]
+                resized_keys.add(key)
+
+        # Only the reinitialized parameters of resized layers may be left out
+        missing_keys, unexpected_keys = self._raw_model.load_state_dict(
+            fresh_state, strict=False
+        )
+        if set(missing_keys) != resized_keys or unexpected_keys:
+            raise RuntimeError(
+                f"Could not reset the model. Missing keys: {missing_keys}, "
+                f"unexpected keys: {unexpected_keys}"
+            )
+
+    def _autocast(self) -> torch.autocast:
+        """
+        Returns the autocast context for the forward passes of the model.
+        :return: The autocast context.
+        """
+        return torch.autocast(
+            device_type=self.device.type, dtype=self.amp_dtype, enabled=self.use_amp
+        )
 
     def k_fold_cv(self, k: int = 10) -> KFoldStats:
         """
@@ -241,30 +361,33 @@ class BaseClassifier(ABC):
 
         fold_stats = []
 
+        # The test set is the same for all folds
+        self.test_loader = dataset_to_dataloader(
+            self.test_dataset, batch_size=self.batch_size
+        )
+
         for idx, fold in enumerate(folds):
             # Log the current fold
             logging.info(f"Fold {idx + 1}/{k}")
 
-            # Fit the model
+            # Fit the model. The workers of the fold loaders are not kept alive, as the
+            # loaders are replaced after the fold.
             train_loader = dataset_to_dataloader(
-                fold.train_set, batch_size=self.batch_size
+                fold.train_set, batch_size=self.batch_size, persistent_workers=False
+            )
+            val_loader = dataset_to_dataloader(
+                fold.val_set, batch_size=self.batch_size, persistent_workers=False
             )
-            val_loader = dataset_to_dataloader(fold.val_set, batch_size=self.batch_size)
             self.train_loader = train_loader
             self.val_loader = val_loader
             _ = self.fit()
 
             # Evaluate the model
-            test_loader = dataset_to_dataloader(
-                self.test_dataset, batch_size=self.batch_size
-            )
-            self.test_loader = test_loader
             stats = self.evaluate()
             fold_stats.append(stats)
 
             # Reset the model
-            self.model = self.model.__class__.build_from_config()
-            self.model.to(self.device)
+            self._reset_model()
 
             # Reset the optimizer using the initial state dict
             self.optimizer = self.optimizer.__class__(
@@ -305,6 +428,8 @@ class BaseClassifier(ABC):
 
         train_stats = TrainStats(0, [])
         best_val_set = float("inf")
+        best_model_path = Path(self.store_dir) / "best_model.pt"
+        stats_path = Path(self.store_dir) / "train_stats.json"
 
         for epoch in range(self.num_epochs):
             train_loss = self._fit_epoch()
@@ -316,45 +441,55 @@ class BaseClassifier(ABC):
 
             # Log the loss
             logging.info(
-                f"Epoch {epoch + 1:02}/{self.num_epochs:02}\n"
-                f"Train loss: {train_loss:.4f}\n"
-                f"Train PPL:  {math.exp(train_loss):7.4f}\n"
-                f"Val   loss: {val_loss:.4f}\n"
-                f"Val   PPL:  {math.exp(val_loss):7.4f}"
+                "Epoch %02d/%02d\nTrain loss: %.4f\nVal   loss: %.4f",
+                epoch + 1,
+                self.num_epochs,
+                train_loss,
+                val_loss,
             )
 
             # TODO: Adjust for k-fold
-            # Save the model
-            self.store(epoch=epoch + 1)
+            # Save the model periodically, if requested
+            if self.checkpoint_every > 0 and (epoch + 1) % self.checkpoint_every == 0:
+                self._store_in_background(epoch=epoch + 1)
 
             # Update best model
             if val_loss < best_val_set:
                 best_val_set = val_loss
                 train_stats.best_epoch = epoch + 1
-                self.store(path=self.store_dir / Path("best_model.pt"))
+                self._store_in_background(path=best_model_path)
+
+        # Save the final model, if not already stored periodically
+        if self.checkpoint_every <= 0 or self.num_epochs % self.checkpoint_every != 0:
+            self._store_in_background(epoch=self.num_epochs)
 
         # Save the training stats
-        save_content_to_file(
-            train_stats.to_json(),
-            self.store_dir / Path("train_stats.json"),
-        )
+        save_content_to_file(train_stats.to_json(), stats_path)
+
+        # Wait until all checkpoints are written
+        self.wait_for_pending_stores()
 
         logging.info("Training done.")
         return train_stats
 
-    def _fit_batch(self, x_batch: ModelInput, y_batch: Tensor) -> float:
+    def _fit_batch(self, x_batch: ModelInput, y_batch: Tensor) -> Tensor:
         """
         Performs a single training iteration.
         :param x_batch: The input of the model as batch.
         :param y_batch: The scores of the batch.
-        :return: The loss of the batch.
+        :return: The loss of the batch as detached tensor on the device.
         """
-        self.optimizer.zero_grad()
-        outputs = self.model(x_batch)
+        self.optimizer.zero_grad(set_to_none=True)
+        with self._autocast():
+            outputs = self._forward(x_batch)
+
+        # The model outputs fp32 (see FullyConnectedModel), as BCELoss is not
+        # autocast-safe
         loss = self.criterion(outputs, y_batch)
-        loss.backward()
-        self.optimizer.step()
-        return loss.item()
+        self.scaler.scale(loss).backward()
+        self.scaler.step(self.optimizer)
+        self.scaler.update()
+        return loss.detach()
 
     def _fit_epoch(self) -> float:
         """
@@ -362,17 +497,25 @@ class BaseClassifier(ABC):
         :return: The train loss of the epoch.
         """
         self.model.train()
-        train_loss = 0.0
+        train_loss = torch.zeros((), device=self.device)
+
+        # Bind the per-batch methods once and check the log level once per epoch
+        batch_to_input, batch_to_score = self._batch_to_input, self._batch_to_score
+        fit_batch = self._fit_batch
+        log_batches = self._log_batches()
+
         for batch in self.train_loader:
-            x = self._batch_to_input(batch)
-            y = self._batch_to_score(batch)
+            x = batch_to_input(batch)
+            y = batch_to_score(batch)
 
-            loss = self._fit_batch(
+            loss = fit_batch(
                 x_batch=x,
                 y_batch=y,
             )
+            if log_batches:
+                self._log_batch_loss("Train", loss)
             train_loss += loss
-        return train_loss / len(self.train_loader)
+        return self._epoch_mean(train_loss, len(self.train_loader))
 
     def _val_epoch(self) -> float:
         """
@@ -380,49 +523,87 @@ class BaseClassifier(ABC):
         :return: The validation loss.
         """
         self.model.eval()
-        val_loss = 0.0
+        val_loss = torch.zeros((), device=self.device)
+
+        # Bind the per-batch methods once and check the log level once per epoch
+        batch_to_input, batch_to_score = self._batch_to_input, self._batch_to_score
+        val_batch = self._val_batch
+        log_batches = self._log_batches()
 
         with torch.no_grad():
             # Iterate through the test loader to evaluate the model
             for batch in self.val_loader:
-                x = self._batch_to_input(batch)
-                y = self._batch_to_score(batch)
+                x = batch_to_input(batch)
+                y = batch_to_score(batch)
 
-                loss = self._val_batch(
+                loss = val_batch(
                     x_batch=x,
                     y_batch=y,
                 )
 
+                if log_batches:
+                    self._log_batch_loss("Val", loss)
                 val_loss += loss
 
-        return val_loss / len(self.val_loader)
+        return self._epoch_mean(val_loss, len(self.val_loader))
 
     def _val_batch(
         self,
         x_batch: ModelInput,
         y_batch: Tensor,
-    ) -> float:
+    ) -> Tensor:
         """
         Evaluates a single batch of the test loader.
         :param x_batch: The input of the model as batch.
         :param y_batch: The scores of the batch.
-        :return: The loss of the batch.
+        :return: The loss of the batch as detached tensor on the device.
         """
-        outputs = self.model(x_batch)
+        with self._autocast():
+            outputs = self._forward(x_batch)
         loss = self.criterion(outputs, y_batch)
-        return loss.item()
+        return loss.detach()
+
+    @staticmethod
+    def _epoch_mean(losses_sum: Tensor, num_batches: int) -> float:
+        """
+        Calculates the mean loss of an epoch. This is the only point where the summed
+        losses are synchronized with the host.
+        :param losses_sum: The sum of the batch losses on the device.
+        :param num_batches: The number of batches.
+        :return: The mean loss.
+        """
+        return (losses_sum / num_batches).item()
+
+    @staticmethod
+    def _log_batches() -> bool:
+        """
+        Checks whether the losses of single batches are logged. Only done in debug
+        mode, because reading the loss forces a synchronization with the device.
+        :return: True if the batch losses are logged.
+        """
+        return logging.getLogger().isEnabledFor(logging.DEBUG)
+
+    @staticmethod
+    def _log_batch_loss(phase: str, loss: Tensor) -> None:
+        """
+        Logs the loss of a single batch.
+        :param phase: The phase of the batch (train or validation).
+        :param loss: The loss of the batch.
+        :return: None
+        """
+        logging.debug(f"{phase} batch loss: {loss.item():.4f}")
 
     @classmethod
-    def _extract(cls, batch: dict) -> tuple[Tensor, dict[str, Tensor], Tensor, Tensor]:
+    def _extract(
+        cls, batch: dict
+    ) -> tuple[Tensor, dict[str, Tensor], Tensor, Tensor | None]:
         """
         Extracts all data from the batch.
         :param batch: The batch to extract the data from.
         :return: The extracted data.
         """
-        matrix = batch["matrix"]
-        bert = batch["bert"]
-        image = batch["image"]
-        score = batch["score"].unsqueeze(1)
+        matrix, bert, image = _get_encodings(batch)
+        score = batch["score"].unsqueeze(1) if "score" in batch else None
         return matrix, bert, image, score
 
     @classmethod
@@ -432,9 +613,7 @@ class BaseClassifier(ABC):
         :param bert: The bert encoding to extract the data from.
         :return: The extracted data.
         """
-        input_ids = bert["input_ids"]
-        token_type_ids = bert["token_type_ids"]
-        attention_mask = bert["attention_mask"]
+        input_ids, token_type_ids, attention_mask = _get_bert_encodings(bert)
         segment_ids = bert.get("segment_ids")
         return input_ids, token_type_ids, attention_mask, segment_ids
 
@@ -453,7 +632,18 @@ class BaseClassifier(ABC):
         :param tensor: The tensor to send to the device.
         :return: The tensor on the device.
         """
-        return tensor.to(self.device)
+        return tensor.to(self.device, non_blocking=True)
+
+    def _image_to_device(self, image: Tensor) -> Tensor:
+        """
+        Sends the image batch to the device in channels-last memory format, which is
+        the fastest layout for the convolutions of the visual extractor.
+        :param image: The image batch to send to the device.
+        :return: The image batch on the device.
+        """
+        return image.to(
+            self.device, non_blocking=True, memory_format=torch.channels_last
+        )
 
     def _batch_to_score(self, batch: dict) -> Tensor:
         """
@@ -468,54 +658,109 @@ class BaseClassifier(ABC):
 
     def store(self, path: str = None, epoch: int = None) -> None:
         """
-        Stores the model at the given path.
+        Stores the model at the given path. Blocks until the model is written to disk.
+        :param path: The path to store the model.
+        :param epoch: The epoch to store the model at.
+        :return: None
+        """
+        self._store_in_background(path=path, epoch=epoch)
+        self.wait_for_pending_stores()
+
+    def _store_in_background(self, path: str = None, epoch: int = None) -> None:
+        """
+        Stores the model at the given path. The model is serialized immediately, but
+        written to disk in the background. Call wait_for_pending_stores to wait for the
+        write and to raise its errors.
         :param path: The path to store the model.
         :param epoch: The epoch to store the model at.
         :return: None
         """
-        current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        if path is None:
+            current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            name = (
+                f"model_{current_time}.pt"
+                if epoch is None
+                else f"model_{current_time}_{epoch}.pt"
+            )
+            path = Path(self.store_dir) / name
 
-        if path is None and epoch is None:
-            path = self.store_dir / Path(f"model_{current_time}.pt")
-        elif path is None:
-            path = self.store_dir / Path(f"model_{current_time}_{epoch}.pt")
+        # Serialize in memory and write the bytes to disk in the background
+        buffer = io.BytesIO()
+        # The default pickle protocol is kept, torch.load(weights_only=True, mmap=True)
+        # only supports checkpoints written with it
+        torch.save(self._raw_model.state_dict(), buffer)
+        data = buffer.getvalue()
+        buffer.close()
 
-        torch.save(self.model.state_dict(), path)
+        self._pending.append(self._io_pool.submit(self._write_model, path, data))
+
+    @staticmethod
+    def _write_model(path: str, data: bytes) -> None:
+        """
+        Writes the serialized model to disk.
+        :param path: The path to store the model.
+        :param data: The serialized model.
+        :return: None
+        """
+        Path(path).write_bytes(data)
         logging.info(f"Model stored at {path}")
 
+    def wait_for_pending_stores(self) -> None:
+        """
+        Blocks until all models passed to store are written to disk.
+        :return: None
+        :raises OSError: If a model could not be written.
+        """
+        pending, self._pending = self._pending, []
+        wait(pending)
+
+        # Raise the first error of a failed write
+        for future in pending:
+            future.result()
+
     def load(self, path: str) -> None:
         """
         Loads the model from the given path.
         :param path: The path to load the model from.
         :return: None
         """
-        self.model.load_state_dict(torch.load(path))
+        # Memory-map the checkpoint and load the tensors directly onto the device
+        state_dict = torch.load(
+            path, map_location=self.device, weights_only=True, mmap=True
+        )
+        self._raw_model.load_state_dict(state_dict)
         logging.info(f"Model loaded from {path}")
 
-    def predict(self, code_snippet: str) -> float:
+    def predict(self, code_snippet: str | list[str]) -> float | list[float]:
         """
-        Predicts the readability of the given code snippet.
-        :param code_snippet: The code snippet to predict the readability of.
-        :return: The predicted readability.
+        Predicts the readability of the given code snippet(s). Multiple code snippets
+        are predicted as one batch.
+        :param code_snippet: The code snippet or a list of code snippets to predict the
+            readability of.
+        :return: The predicted readability or a list of the predicted readabilities.
         """
         self.model.eval()
 
-        # Encode the code snippet
-        encoder = DatasetEncoder()
-        encoded_text = encoder.encode_text(code_snippet)
-        matrix = encoded_text["matrix"]
-        input_ids = encoded_text["input_ids"]
-        token_type_ids = encoded_text["token_type_ids"]
-        image = encoded_text["image"]
+        # Encode the code snippets and stack them to one batch (bert is already batched)
+        snippets = [code_snippet] if isinstance(code_snippet, str) else code_snippet
+        if not snippets:
+            return []
+        encoded = [self._encoder.encode_text(snippet)[0] for snippet in snippets]
+        batch = {
+            "matrix": torch.stack([sample["matrix"] for sample in encoded]),
+            "bert": {
+                key: torch.cat([sample["bert"][key] for sample in encoded])
+                for key in encoded[0]["bert"]
+            },
+            "image": torch.stack([sample["image"] for sample in encoded]),
+        }
+
+        # Predict the readability with a single forward pass
+        with torch.inference_mode(), self._autocast():
+            x = self._batch_to_input(batch)
+            predictions = self._forward(x).flatten().tolist()
 
-        # Predict the readability
-        with torch.no_grad():
-            matrix = matrix.to(self.device)
-            input_ids = input_ids.to(self.device)
-            token_type_ids = token_type_ids.to(self.device)
-            image = image.to(self.device)
-            prediction = self.model(matrix, input_ids, token_type_ids, image)
-            return prediction.item()
+        return predictions[0] if isinstance(code_snippet, str) else predictions
 
     def evaluate(self) -> EvaluationStats:
         """
@@ -526,27 +771,36 @@ class BaseClassifier(ABC):
             raise ValueError("No test data provided.")
 
         self.model.eval()
-        y_true = []  # True scores
-        y_pred = []  # Predicted scores
+
+        # Preallocate the scores of the whole test set on the device
+        num_samples = len(self.test_loader.dataset)
+        y_true = torch.empty(num_samples, device=self.device)  # True scores
+        y_pred = torch.empty(num_samples, device=self.device)  # Predicted scores
+        offset = 0
 
         # Iterate through the test data loader to collect true and predicted labels
-        for batch in self.test_loader:
-            x = self._batch_to_input(batch)
-            y = self._batch_to_score(batch)
+        with torch.inference_mode(), self._autocast():
+            for batch in self.test_loader:
+                x = self._batch_to_input(batch)
+                y = self._batch_to_score(batch)
 
-            y_true.append(y)
-            y_pred.append(self.model(x))
+                batch_size = y.size(0)
+                y_true[offset : offset + batch_size] = y.flatten()
+                y_pred[offset : offset + batch_size] = self._forward(x).flatten()
+                offset += batch_size
 
-        # Move the labels to the CPU and concatenate the arrays
+        # Move the labels to the CPU at once
         # For Binary Encoding
-        y_true = np.concatenate([np.array(y.cpu()).flatten() for y in y_true])
-        y_pred = np.concatenate([np.array(y.cpu().detach()).flatten() for y in y_pred])
+        y_true = y_true.cpu().numpy()
+        y_pred = y_pred.cpu().numpy()
 
         # For One Hot Encoding
         # y_true = np.concatenate([np.array(y.cpu()) for y in y_true])
         # y_pred = np.concatenate([np.array(y.cpu().detach()) for y in y_pred])
 
         # Binary: Convert the scores to binary labels with a threshold of 0.5
+        # The predicted scores are kept for the AUC, which needs a ranking
+        y_score = y_pred
         y_pred = np.where(y_pred >= 0.5, 1, 0)
         y_true = np.where(y_true >= 0.5, 1, 0)
 
@@ -556,10 +810,10 @@ class BaseClassifier(ABC):
 
         # Calculate evaluation metrics
         accuracy = accuracy_score(y_true, y_pred)
-        precision = precision_score(y_true, y_pred)
-        recall = recall_score(y_true, y_pred)
-        f1 = f1_score(y_true, y_pred)
-        auc = roc_auc_score(y_true, y_pred)
+        precision, recall, f1, _ = precision_recall_fscore_support(
+            y_true, y_pred, average="binary"
+        )
+        auc = roc_auc_score(y_true, y_score)
         mcc = matthews_corrcoef(y_true, y_pred)
 
         # Log the evaluation stats
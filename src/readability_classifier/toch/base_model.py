@@ -48,7 +48,11 @@ class BaseModel(nn.Module, ABC):
         :return: Returns the loaded model.
         """
         model = cls.build_from_config()
-        model.load_state_dict(torch.load(checkpoint_path))
+        model.load_state_dict(
+            torch.load(
+                checkpoint_path, map_location=model.device, weights_only=True, mmap=True
+            )
+        )
         return model
 
     @classmethod
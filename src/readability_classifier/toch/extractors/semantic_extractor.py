@@ -85,6 +85,15 @@ class BertEmbedding(nn.Module):
         self.position_embedding.to(self.device)
         self.token_type_embedding.to(self.device)
 
+        # Position ids of the longest possible input, sliced to the input length
+        self.register_buffer(
+            "position_ids",
+            torch.arange(
+                config.max_position_embeddings, dtype=torch.long, device=self.device
+            ).unsqueeze(0),
+            persistent=False,
+        )
+
     def embed(
         self, input_ids: torch.Tensor, token_type_ids: torch.Tensor
     ) -> torch.Tensor:
@@ -96,25 +105,28 @@ class BertEmbedding(nn.Module):
         """
         batch_size, sequence_length = input_ids.size()
 
-        # Create position ids
-        position_ids = torch.arange(sequence_length, dtype=torch.long).unsqueeze(0)
-        position_ids = position_ids % self.position_embedding.weight.size(0)
-
-        # Create token type ids
-        if token_type_ids is None:
-            token_type_ids = torch.full_like(input_ids, 0)
+        # Get position ids (wrap around if the input is longer than the embedding)
+        max_positions = self.position_ids.size(1)
+        if sequence_length <= max_positions:
+            position_ids = self.position_ids[:, :sequence_length]
+        else:
+            position_ids = self.position_ids.new_tensor(
+                [[i % max_positions for i in range(sequence_length)]]
+            )
 
         # Move input tensors to GPU
         input_ids = input_ids.to(self.device)
-        token_type_ids = token_type_ids.to(self.device)
-
-        # Get embeddings
-        position_embeddings = self.position_embedding(position_ids.to(input_ids.device))
-        token_type_embeddings = self.token_type_embedding(token_type_ids)
-        token_embeddings = self.token_embedding(input_ids)
 
-        # Sum all embeddings and apply layer norm and dropout
-        embeddings = token_embeddings + token_type_embeddings + position_embeddings
+        # Create token type ids
+        if token_type_ids is None:
+            token_type_ids = input_ids.new_zeros(input_ids.shape)
+        else:
+            token_type_ids = token_type_ids.to(self.device)
+
+        # Sum all embeddings in place and apply layer norm and dropout
+        embeddings = self.token_embedding(input_ids)
+        embeddings.add_(self.token_type_embedding(token_type_ids))
+        embeddings.add_(self.position_embedding(position_ids))
         embeddings = self.layer_norm(embeddings)
         return self.dropout(embeddings)
 
@@ -161,7 +173,7 @@ class SemanticExtractor(BaseModel):
         self.conv2 = nn.Conv1d(in_channels=32, out_channels=32, kernel_size=5)
 
         # In paper: args not specified
-        self.bidirectional_lstm = nn.LSTM(32, 32, bidirectional=True, batch_first=True)
+        self.bidirectional_lstm = nn.LSTM(32, 32, bidirectional=True, batch_first=False)
 
     def forward(self, x: SemanticInput) -> torch.Tensor:
         """
@@ -184,15 +196,14 @@ class SemanticExtractor(BaseModel):
         x = self.maxpool1(x)
         x = self.relu(self.conv2(x))
 
-        # Permute the tensor to fit the LSTM layer
-        x = x.permute(0, 2, 1)
+        # Permute the tensor to the (sequence, batch, channels) layout of the LSTM
+        x = x.permute(2, 0, 1).contiguous()
 
         # LSTM layer
         x, _ = self.bidirectional_lstm(x)
 
-        # Flatten the tensor after LSTM
-        batch_size, seq_length, channels = x.size()
-        return x.contiguous().view(batch_size, -1)  # Flatten the tensor
+        # Flatten the tensor after LSTM (batch first again)
+        return x.transpose(0, 1).reshape(x.size(1), -1)
 
     @classmethod
     def _build_from_config(cls, params: dict[str, ...], save: Path) -> "BaseModel":
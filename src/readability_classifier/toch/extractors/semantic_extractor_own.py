@@ -13,6 +13,12 @@ CURR_DIR = Path(os.path.dirname(os.path.relpath(__file__)))
 DEFAULT_SAVE_PATH = CURR_DIR / Path("../../../models/")
 CONFIGS_PATH = CURR_DIR / Path("../../res/models/")
 
+# Frozen Bert models shared by all OwnBertEmbeddings, by model name and device
+_BERT_CACHE: dict[tuple[str, torch.device], BertModel] = {}
+
+# Id of the [NL] token, which the BertEncoder adds to the vocabulary of bert-base-cased
+NL_TOKEN_ID = 28996
+
 
 # TODO: Try BertForPreTraining
 
@@ -66,11 +72,19 @@ class OwnBertEmbedding(BaseModel):
         # Specify device
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-        # Load model for token type embedding
+        # Load model for token type embedding. The frozen model is shared by all
+        # OwnBertEmbeddings, so it is not registered as submodule (see model)
         self.model_name = "bert-base-cased"
-        self.model = BertModel.from_pretrained(self.model_name)
-        self.model.to(self.device)
-        self.model.resize_token_embeddings(28996 + 1)
+        bert = _load_frozen_bert(self.model_name, self.device)
+
+        # The embedding of the [NL] token is not pretrained. It is owned (and stored)
+        # by each model, the row of the shared Bert model is never used.
+        self.register_buffer(
+            "nl_token_embedding",
+            torch.empty(bert.config.hidden_size, device=self.device).normal_(
+                mean=0.0, std=bert.config.initializer_range
+            ),
+        )
 
         # Initialize other embeddings
         self.segment_embedding = nn.Embedding(
@@ -145,6 +159,47 @@ class OwnBertEmbedding(BaseModel):
         embeddings = self.layer_norm(embeddings)
         return self.dropout(embeddings)
 
+    @property
+    def model(self) -> BertModel:
+        """
+        The frozen Bert model shared by all OwnBertEmbeddings on the same device. It is
+        not a submodule and thus not part of the state dict, so loading a checkpoint
+        into one model does not change the Bert model of the others.
+        :return: The frozen Bert model.
+        """
+        return _BERT_CACHE[(self.model_name, self.device)]
+
+    def _load_from_state_dict(self, state_dict: dict, prefix: str, *args) -> None:
+        """
+        Loads the own parameters from the state dict. Checkpoints of older versions
+        contain the Bert model, which is not part of the state anymore. Only their
+        embedding of the [NL] token is loaded, the other Bert weights are skipped.
+        :param state_dict: The state dict to load the parameters from.
+        :param prefix: The prefix of the keys of this module.
+        :param args: The other arguments of nn.Module._load_from_state_dict.
+        :return: None
+        """
+        word_embeddings_key = f"{prefix}model.embeddings.word_embeddings.weight"
+        if word_embeddings_key in state_dict:
+            state_dict.setdefault(
+                f"{prefix}nl_token_embedding",
+                state_dict[word_embeddings_key][NL_TOKEN_ID],
+            )
+        for key in [key for key in state_dict if key.startswith(f"{prefix}model.")]:
+            del state_dict[key]
+        super()._load_from_state_dict(state_dict, prefix, *args)
+
+    def train(self, mode: bool = True) -> "OwnBertEmbedding":
+        """
+        Sets the module in training or evaluation mode. The frozen Bert model always
+        stays in evaluation mode.
+        :param mode: Whether to set training mode (True) or evaluation mode (False).
+        :return: The module.
+        """
+        super().train(mode)
+        self.model.eval()
+        return self
+
     def _model_pass(self, x: SemanticInput) -> torch.Tensor:
         """
         Pass the input through the Bert model.
@@ -154,8 +209,16 @@ class OwnBertEmbedding(BaseModel):
         input_ids = x.input_ids
         token_type_ids = x.token_type_ids
         attention_mask = x.attention_mask
+
+        # Embed the [NL] tokens with the own embedding instead of the shared one
+        word_embeddings = self.model.get_input_embeddings()(input_ids)
+        is_nl_token = (input_ids == NL_TOKEN_ID).unsqueeze(-1)
+        inputs_embeds = torch.where(
+            is_nl_token, self.nl_token_embedding, word_embeddings
+        )
+
         outputs = self.model(
-            input_ids=input_ids,
+            inputs_embeds=inputs_embeds,
             token_type_ids=token_type_ids,
             attention_mask=attention_mask,
             return_dict=True,
@@ -173,6 +236,28 @@ class OwnBertEmbedding(BaseModel):
         return cls(OwnBertConfig(**params))
 
 
+def _load_frozen_bert(model_name: str, device: torch.device) -> BertModel:
+    """
+    Loads the pretrained Bert model with the given name. The model is frozen, so it is
+    loaded only once and then shared by all models on the same device.
+    :param model_name: The name of the pretrained Bert model.
+    :param device: The device to put the model on.
+    :return: The frozen Bert model.
+    """
+    key = (model_name, device)
+    if key not in _BERT_CACHE:
+        model = BertModel.from_pretrained(model_name)
+        model.to(device)
+        model.resize_token_embeddings(NL_TOKEN_ID + 1)
+
+        # Freeze the Bert model, it is only used to compute the token embeddings
+        model.requires_grad_(False)
+        model.eval()
+
+        _BERT_CACHE[key] = model
+    return _BERT_CACHE[key]
+
+
 class OwnSemanticExtractorConfig:
     """
     Configuration class to store the configuration of a `SemanticExtractor`.
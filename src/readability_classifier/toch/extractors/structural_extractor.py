@@ -34,7 +34,7 @@ class StructuralExtractor(BaseModel):
         super().__init__()
 
         # Alternating 2D convolution and max-pooling layers
-        self.relu = nn.ReLU()
+        self.relu = nn.ReLU(inplace=True)
 
         # In code: kernel_size=3
         self.conv1 = nn.Conv2d(in_channels=1, out_channels=32, kernel_size=2)
@@ -65,8 +65,10 @@ class StructuralExtractor(BaseModel):
         """
         x = x.character_matrix
 
+        # Add the channel dimension in channels last layout (for the NHWC kernels)
+        x = x.unsqueeze(1).contiguous(memory_format=torch.channels_last)
+
         # Apply convolutional and pooling layers
-        x = x.unsqueeze(1)
         x = self.relu(self.conv1(x))
         x = self.pool1(x)
         x = self.relu(self.conv2(x))
@@ -64,7 +64,8 @@ class VisualExtractor(BaseModel):
         :param x: The input tensor, which is an image.
         :return: The output tensor.
         """
-        x = x.image
+        # Use channels last layout to enable the faster NHWC convolution kernels
+        x = x.image.contiguous(memory_format=torch.channels_last)
 
         # Apply convolutional and pooling layers
         x = self.relu(self.conv1(x))
@@ -35,8 +35,12 @@ class FullyConnectedModel(nn.Module):
         x = self.dropout1(x)
         x = self.dense2(x)
         x = self.relu2(x)
-        x = self.dense3(x)
-        return self.sigmoid(x)
+
+        # The last layer and the sigmoid always run in fp32. In bf16/fp16 (autocast)
+        # the sigmoid saturates to 1.0, which breaks the loss and the AUC.
+        with torch.autocast(device_type=x.device.type, enabled=False):
+            x = self.dense3(x.float())
+            return self.sigmoid(x)
 
     # TODO: .to(device) makes tests fail but is necessary to enable input size change
     def update_input_length(self, input_length: int, device: torch.device) -> None:
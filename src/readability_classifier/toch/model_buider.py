@@ -1,12 +1,13 @@
-from enum import Enum
 from pathlib import Path
-from typing import Any
 
 from torch import nn
 from torch.utils.data import DataLoader
 
 from src.readability_classifier.encoders.dataset_utils import ReadabilityDataset
-from src.readability_classifier.toch.models.semantic_classifier import SemanticClassifier
+from src.readability_classifier.toch.model_type import Model
+from src.readability_classifier.toch.models.semantic_classifier import (
+    SemanticClassifier,
+)
 from src.readability_classifier.toch.models.structural_classifier import (
     StructuralClassifier,
 )
@@ -28,6 +29,7 @@ class ClassifierBuilder:
     _batch_size: int = DEFAULT_MODEL_BATCH_SIZE
     _num_epochs: int = 20
     _learning_rate: float = 0.0015
+    _checkpoint_every: int = 0
 
     def set_model(self, model: nn.Module):
         self._model = model
@@ -53,6 +55,9 @@ class ClassifierBuilder:
         self._num_epochs = num_epochs
         self._learning_rate = learning_rate
 
+    def set_checkpoint_every(self, checkpoint_every: int):
+        self._checkpoint_every = checkpoint_every
+
     def set_evaluation_loader(self, test_loader: DataLoader):
         self._test_loader = test_loader
 
@@ -75,6 +80,7 @@ class ClassifierBuilder:
                 batch_size=self._batch_size,
                 num_epochs=self._num_epochs,
                 learning_rate=self._learning_rate,
+                checkpoint_every=self._checkpoint_every,
             )
         if self._model == Model.STRUCTURAL:
             return StructuralClassifier(
@@ -88,6 +94,7 @@ class ClassifierBuilder:
                 batch_size=self._batch_size,
                 num_epochs=self._num_epochs,
                 learning_rate=self._learning_rate,
+                checkpoint_every=self._checkpoint_every,
             )
         if self._model == Model.VISUAL:
             return VisualClassifier(
@@ -101,6 +108,7 @@ class ClassifierBuilder:
                 batch_size=self._batch_size,
                 num_epochs=self._num_epochs,
                 learning_rate=self._learning_rate,
+                checkpoint_every=self._checkpoint_every,
             )
         if self._model == Model.SEMANTIC:
             return SemanticClassifier(
@@ -114,6 +122,7 @@ class ClassifierBuilder:
                 batch_size=self._batch_size,
                 num_epochs=self._num_epochs,
                 learning_rate=self._learning_rate,
+                checkpoint_every=self._checkpoint_every,
             )
         if self._model == Model.VIST:
             return ViStClassifier(
@@ -127,30 +136,6 @@ class ClassifierBuilder:
                 batch_size=self._batch_size,
                 num_epochs=self._num_epochs,
                 learning_rate=self._learning_rate,
+                checkpoint_every=self._checkpoint_every,
             )
         raise ValueError(f"Unknown model {self._model}")
-
-
-class Model(Enum):
-    """
-    Enum for the different models.
-    """
-
-    TOWARDS = "TOWARDS"
-    STRUCTURAL = "STRUCTURAL"
-    VISUAL = "VISUAL"
-    SEMANTIC = "SEMANTIC"
-    VIST = "VIST"
-
-    @classmethod
-    def _missing_(cls, value: object) -> Any:
-        raise ModelNotSupportedException(f"{value} is not a supported model.")
-
-    def __str__(self) -> str:
-        return self.value
-
-
-class ModelNotSupportedException(Exception):
-    """
-    Exception is thrown whenever a model is not supported.
-    """
@@ -9,6 +9,7 @@ from src.readability_classifier.encoders.dataset_utils import (
     split_train_val,
 )
 from src.readability_classifier.toch.model_buider import ClassifierBuilder
+from src.readability_classifier.toch.model_type import Model
 from src.readability_classifier.toch.towards_classifier import TowardsClassifier
 
 
@@ -89,12 +90,13 @@ class TorchModelRunner(ModelRunnerInterface):
         :return: None
         """
         # Get the parsed arguments
-        model = parsed_args.model
+        model = Model(parsed_args.model)
         store_dir = parsed_args.save
         evaluate = parsed_args.evaluate
         batch_size = parsed_args.batch_size
         num_epochs = parsed_args.epochs
         learning_rate = parsed_args.learning_rate
+        checkpoint_every = parsed_args.checkpoint_every
 
         # Split the dataset
         train_test = split_train_test(encoded_data)
@@ -110,6 +112,7 @@ class TorchModelRunner(ModelRunnerInterface):
         builder.set_model(model)
         builder.set_dataloaders(train_loader, test_loader, val_loader)
         builder.set_parameters(store_dir, batch_size, num_epochs, learning_rate)
+        builder.set_checkpoint_every(checkpoint_every)
         classifier = builder.build()
 
         # Train the model
@@ -127,11 +130,12 @@ class TorchModelRunner(ModelRunnerInterface):
         :return: None
         """
         # Get the parsed arguments
-        model = parsed_args.model
+        model = Model(parsed_args.model)
         store_dir = parsed_args.save
         batch_size = parsed_args.batch_size
         num_epochs = parsed_args.epochs
         learning_rate = parsed_args.learning_rate
+        checkpoint_every = parsed_args.checkpoint_every
 
         # Build the model
         train_test = split_train_test(encoded_data)
@@ -142,6 +146,7 @@ class TorchModelRunner(ModelRunnerInterface):
         builder.set_model(model)
         builder.set_datasets(train_dataset, test_dataset)
         builder.set_parameters(store_dir, batch_size, num_epochs, learning_rate)
+        builder.set_checkpoint_every(checkpoint_every)
         classifier = builder.build()
 
         # Train the model
@@ -176,7 +181,7 @@ class TorchModelRunner(ModelRunnerInterface):
         # Get the parsed arguments
         model_path = parsed_args.load
         data_dir = parsed_args.input
-        model = parsed_args.model
+        model = Model(parsed_args.model)
         batch_size = parsed_args.batch_size
 
         # Load the dataset
@@ -0,0 +1,28 @@
+# Kept free of torch imports, so that the CLI can list the models without loading torch.
+from enum import Enum
+from typing import Any
+
+
+class Model(Enum):
+    """
+    Enum for the different models.
+    """
+
+    TOWARDS = "TOWARDS"
+    STRUCTURAL = "STRUCTURAL"
+    VISUAL = "VISUAL"
+    SEMANTIC = "SEMANTIC"
+    VIST = "VIST"
+
+    @classmethod
+    def _missing_(cls, value: object) -> Any:
+        raise ModelNotSupportedException(f"{value} is not a supported model.")
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class ModelNotSupportedException(Exception):
+    """
+    Exception is thrown whenever a model is not supported.
+    """
@@ -34,6 +34,7 @@ class SemanticClassifier(BaseClassifier):
         batch_size: int = DEFAULT_MODEL_BATCH_SIZE,
         num_epochs: int = 20,
         learning_rate: float = 0.0015,
+        checkpoint_every: int = 0,
     ):
         """
         Initializes the classifier.
@@ -44,6 +45,7 @@ class SemanticClassifier(BaseClassifier):
         :param batch_size: The batch size.
         :param num_epochs: The number of epochs.
         :param learning_rate: The learning rate.
+        :param checkpoint_every: Store the model every k epochs. 0 to disable.
         """
         if model_path is None:
             model = SemanticModel.build_from_config()
@@ -66,6 +68,7 @@ class SemanticClassifier(BaseClassifier):
             batch_size=batch_size,
             num_epochs=num_epochs,
             learning_rate=learning_rate,
+            checkpoint_every=checkpoint_every,
         )
 
     def _batch_to_input(self, batch: dict) -> ModelInput:
@@ -78,11 +81,11 @@ class SemanticClassifier(BaseClassifier):
         input_ids, token_type_ids, attention_mask, segment_ids = self._extract_bert(
             bert
         )
-        input_ids = input_ids.to(self.device)
-        token_type_ids = token_type_ids.to(self.device)
-        attention_mask = attention_mask.to(self.device)
+        input_ids = self._to_device(input_ids)
+        token_type_ids = self._to_device(token_type_ids)
+        attention_mask = self._to_device(attention_mask)
         if segment_ids is not None:
-            segment_ids = segment_ids.to(self.device)
+            segment_ids = self._to_device(segment_ids)
         return SemanticInput(
             input_ids=input_ids,
             token_type_ids=token_type_ids,
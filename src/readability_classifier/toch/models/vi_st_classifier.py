@@ -35,6 +35,7 @@ class ViStClassifier(BaseClassifier):
         batch_size: int = DEFAULT_MODEL_BATCH_SIZE,
         num_epochs: int = 20,
         learning_rate: float = 0.0015,
+        checkpoint_every: int = 0,
     ):
         """
         Initializes the classifier.
@@ -45,6 +46,7 @@ class ViStClassifier(BaseClassifier):
         :param batch_size: The batch size.
         :param num_epochs: The number of epochs.
         :param learning_rate: The learning rate.
+        :param checkpoint_every: Store the model every k epochs. 0 to disable.
         """
         if model_path is None:
             model = ViStModel.build_from_config()
@@ -67,6 +69,7 @@ class ViStClassifier(BaseClassifier):
             batch_size=batch_size,
             num_epochs=num_epochs,
             learning_rate=learning_rate,
+            checkpoint_every=checkpoint_every,
         )
 
     def _batch_to_input(self, batch: dict) -> ModelInput:
@@ -76,6 +79,6 @@ class ViStClassifier(BaseClassifier):
         :return: The model input.
         """
         matrix, _, image, _ = self._extract(batch)
-        image = self._to_device(image)
+        image = self._image_to_device(image)
         matrix = self._to_device(matrix)
         return ViStModelInput(image=image, matrix=matrix)
@@ -34,6 +34,7 @@ class VisualClassifier(BaseClassifier):
         batch_size: int = DEFAULT_MODEL_BATCH_SIZE,
         num_epochs: int = 20,
         learning_rate: float = 0.0015,
+        checkpoint_every: int = 0,
     ):
         """
         Initializes the classifier.
@@ -44,6 +45,7 @@ class VisualClassifier(BaseClassifier):
         :param batch_size: The batch size.
         :param num_epochs: The number of epochs.
         :param learning_rate: The learning rate.
+        :param checkpoint_every: Store the model every k epochs. 0 to disable.
         """
         if model_path is None:
             model = VisualModel.build_from_config()
@@ -66,6 +68,7 @@ class VisualClassifier(BaseClassifier):
             batch_size=batch_size,
             num_epochs=num_epochs,
             learning_rate=learning_rate,
+            checkpoint_every=checkpoint_every,
         )
 
     def _batch_to_input(self, batch: dict) -> ModelInput:
@@ -75,5 +78,5 @@ class VisualClassifier(BaseClassifier):
         :return: The model input.
         """
         _, _, image, _ = self._extract(batch)
-        image = self._to_device(image)
+        image = self._image_to_device(image)
         return VisualInput(image)
@@ -6,10 +6,16 @@ from pathlib import Path
 from typing import Any
 
 import numpy as np
+import orjson
 import yaml
 from transformers import BertTokenizer
 from yaml import SafeLoader
 
+# Stats files are written as json with an indent of 2. Dataclasses and numpy values
+# are serialized natively, NaN and infinity are written as null (valid json). Older
+# versions wrote the stats compact (torch) or with an indent of 4 (keras) and wrote NaN.
+STATS_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+
 
 def read_content_of_file(file: Path, encoding: str = "utf-8") -> str:
     """
@@ -179,6 +185,15 @@ def save_content_to_file(content: str, file: Path) -> None:
         file_stream.write(content)
 
 
+def stats_to_json(stats: Any) -> str:
+    """
+    Converts the given stats (dataclasses, dicts, lists, numpy values) to json.
+    :param stats: The stats to convert.
+    :return: Returns the json string.
+    """
+    return orjson.dumps(stats, option=STATS_JSON_OPTIONS).decode()
+
+
 def get_from_dict(dictionary, key_start: str, key_start_2: str = None):
     """
     Get a value from a dict by key_start. The first value of the dict where the key
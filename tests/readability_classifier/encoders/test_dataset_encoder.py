@@ -1,11 +1,17 @@
 import unittest
 
+import torch
+
 from src.readability_classifier.encoders.dataset_encoder import DatasetEncoder
 from src.readability_classifier.encoders.dataset_utils import (
     load_raw_dataset,
     store_encoded_dataset,
 )
-from tests.readability_classifier.utils.utils import RAW_COMBINED_DIR, DirTest
+from tests.readability_classifier.utils.utils import (
+    RAW_BW_DIR,
+    RAW_COMBINED_DIR,
+    DirTest,
+)
 
 
 class TestDatasetEncoder(DirTest):
@@ -27,6 +33,23 @@ class TestDatasetEncoder(DirTest):
         # Check if encoded data is not empty
         assert len(encoded_data) > 0
 
+    def test_encode_dataset_in_parallel(self):
+        raw_data = load_raw_dataset(RAW_BW_DIR.absolute())[:5]
+
+        # Encode raw data in the current process and in two processes
+        encoded_serial = self.encoder.encode_dataset(raw_data, num_workers=1)
+        encoded_parallel = self.encoder.encode_dataset(raw_data, num_workers=2)
+
+        # Check if the samples are identical and in the same order
+        assert len(encoded_serial) == len(encoded_parallel) == len(raw_data)
+        for serial, parallel in zip(encoded_serial, encoded_parallel):
+            assert serial["name"] == parallel["name"]
+            assert torch.equal(serial["matrix"], parallel["matrix"])
+            assert torch.equal(serial["image"], parallel["image"])
+            assert torch.equal(serial["score"], parallel["score"])
+            for key, value in serial["bert"].items():
+                assert torch.equal(value, parallel["bert"][key])
+
     def test_encode_text(self):
         code = """
         // A method for counting
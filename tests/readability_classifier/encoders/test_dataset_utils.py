@@ -1,10 +1,18 @@
-import unittest
+import os
+from pathlib import Path
 
-from src.readability_classifier.encoders.dataset_utils import load_encoded_dataset
-from tests.readability_classifier.utils.utils import ENCODED_SCALABRIO_DIR
+from datasets import Dataset as HFDataset
 
+from src.readability_classifier.encoders.dataset_utils import (
+    MAX_LOADER_WORKERS,
+    dataset_cache_key,
+    dataset_to_dataloader,
+    load_encoded_dataset,
+)
+from tests.readability_classifier.utils.utils import ENCODED_SCALABRIO_DIR, DirTest
 
-class TestDatasetUtils(unittest.TestCase):
+
+class TestDatasetUtils(DirTest):
     def test_load_encoded_dataset(self):
         data_dir = str(ENCODED_SCALABRIO_DIR.absolute())
 
@@ -14,8 +22,72 @@ class TestDatasetUtils(unittest.TestCase):
         # Check if encoded data is not empty
         assert len(encoded_data) > 0
 
+    def test_load_empty_encoded_dataset(self):
+        data_dir = str(Path(self.output_dir) / "empty")
+        HFDataset.from_list([]).save_to_disk(data_dir)
+
+        encoded_data = load_encoded_dataset(data_dir)
+
+        assert len(encoded_data) == 0
+
+    def test_load_encoded_dataset_with_different_bert_keys(self):
+        data_dir = str(Path(self.output_dir) / "mixed")
+        sample = {"matrix": [[0.0]], "image": [[0.0]], "score": 0.5}
+        HFDataset.from_list(
+            [
+                {**sample, "bert": {"input_ids": [1], "segment_ids": None}},
+                {**sample, "bert": {"input_ids": [1], "segment_ids": [0]}},
+            ]
+        ).save_to_disk(data_dir)
+
+        with self.assertRaises(ValueError):
+            load_encoded_dataset(data_dir)
+
     def test_split_dataset(self):
         data_dir = str(ENCODED_SCALABRIO_DIR.absolute())
         encoded_data = load_encoded_dataset(data_dir)
         encoded_data = encoded_data.split(10)
         assert len(encoded_data) == 10
+
+    def test_dataset_to_dataloader(self):
+        data_dir = str(ENCODED_SCALABRIO_DIR.absolute())
+        encoded_data = load_encoded_dataset(data_dir)
+
+        loader = dataset_to_dataloader(encoded_data, persistent_workers=False)
+
+        # The number of workers is capped and they are not kept alive
+        assert loader.num_workers <= MAX_LOADER_WORKERS
+        assert not loader.persistent_workers
+
+    def test_dataset_cache_key(self):
+        data_dir = Path(self.output_dir)
+        (data_dir / "sub").mkdir()
+        (data_dir / "a.txt").write_text("a")
+        (data_dir / "sub" / "b.txt").write_text("b")
+
+        key = dataset_cache_key(str(data_dir))
+
+        # The key is stable and depends on the settings
+        assert key == dataset_cache_key(str(data_dir))
+        assert key != dataset_cache_key(str(data_dir), settings=(100, False))
+
+        # A changed file content changes the key
+        (data_dir / "sub" / "b.txt").write_text("c")
+        assert key != dataset_cache_key(str(data_dir))
+
+    def test_dataset_cache_key_without_content(self):
+        data_dir = Path(self.output_dir)
+        file = data_dir / "a.txt"
+        file.write_text("a")
+        os.utime(file, ns=(0, 0))
+
+        key = dataset_cache_key(str(data_dir), hash_content=False)
+
+        # Same size and modification time: the key does not change
+        file.write_text("b")
+        os.utime(file, ns=(0, 0))
+        assert key == dataset_cache_key(str(data_dir), hash_content=False)
+
+        # A changed modification time changes the key
+        os.utime(file, ns=(1, 1))
+        assert key != dataset_cache_key(str(data_dir), hash_content=False)
@@ -1,6 +1,5 @@
 import json
 import pickle
-from dataclasses import asdict
 from pathlib import Path
 
 import keras
@@ -9,6 +8,11 @@ from src.readability_classifier.keas.history_processing import (
     HistoryList,
     HistoryProcessor,
 )
+from src.readability_classifier.utils.utils import (
+    read_content_of_file,
+    save_content_to_file,
+    stats_to_json,
+)
 from tests.readability_classifier.utils.utils import HISTORY_FILE, STATS_FILE, DirTest
 
 
@@ -110,13 +114,13 @@ class TestHistoryProcessor(DirTest):
         # Convert to json
         file_name = "stats.json"
         path = Path(self.output_dir) / file_name
-        with open(path, "w") as file:
-            json.dump(asdict(actual_stats), file, indent=4)
-        with open(path) as file:
-            actual_stats = json.load(file)
+        save_content_to_file(stats_to_json(actual_stats), path)
+        actual_json = read_content_of_file(path)
 
         # Load expected stats
-        with open(STATS_FILE) as file:
-            expected_stats = json.load(file)
+        expected_json = read_content_of_file(STATS_FILE)
+
+        assert json.loads(actual_json) == json.loads(expected_json)
 
-        assert actual_stats == expected_stats
+        # The stats file is written with the same layout (indent of 2)
+        assert actual_json == expected_json.rstrip("\n")
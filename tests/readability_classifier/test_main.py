@@ -1,12 +1,25 @@
 import os
+import shutil
 import unittest
+from pathlib import Path
 
+from src.readability_classifier.encoders.bert_encoder import (
+    DEFAULT_OWN_SEGMENT_IDS,
+    DEFAULT_TOKEN_LENGTH,
+)
+from src.readability_classifier.encoders.dataset_utils import (
+    dataset_cache_key,
+    load_encoded_dataset,
+)
 from src.readability_classifier.keas.model_runner import KerasModelRunner
 from src.readability_classifier.main import (
+    CACHE_KEY_FILE,
+    _load_or_encode,
     _run_encode,
     _run_evaluate,
     _run_predict,
     _run_train,
+    _set_up_arg_parser,
 )
 from tests.readability_classifier.utils.utils import (
     BW_SNIPPET_1,
@@ -25,6 +38,7 @@ class TestRunMain(DirTest):
                 self.input = RAW_BW_DIR
                 self.save = save
                 self.intermediate = save
+                self.encode_workers = 1
 
         parsed_args = MockParsedArgs()
 
@@ -85,3 +99,49 @@ class TestRunMain(DirTest):
 
         assert clazz == "Readable"
         assert score == 0.9999087452888489
+
+
+class TestLoadOrEncode(DirTest):
+    def _prepare_intermediate_dir(self, key: str) -> Path:
+        # An encoded dataset stored by a previous run with the given key
+        intermediate_dir = Path(self.output_dir) / "intermediate"
+        shutil.copytree(ENCODED_BW_DIR, intermediate_dir)
+        (intermediate_dir / CACHE_KEY_FILE).write_text(key)
+        return intermediate_dir
+
+    def test_load_or_encode_cache_hit(self):
+        key = dataset_cache_key(
+            RAW_BW_DIR, settings=(DEFAULT_TOKEN_LENGTH, DEFAULT_OWN_SEGMENT_IDS)
+        )
+        intermediate_dir = self._prepare_intermediate_dir(key)
+
+        encoded_data = _load_or_encode(RAW_BW_DIR, intermediate_dir, num_workers=1)
+
+        # The stored encoded dataset is loaded and left unchanged
+        assert len(encoded_data) == len(load_encoded_dataset(str(ENCODED_BW_DIR)))
+        assert (intermediate_dir / CACHE_KEY_FILE).read_text() == key
+
+    def test_load_or_encode_cache_miss(self):
+        intermediate_dir = self._prepare_intermediate_dir("outdated")
+
+        encoded_data = _load_or_encode(RAW_BW_DIR, intermediate_dir, num_workers=1)
+
+        # The raw dataset is encoded again and stored with its key (old layout)
+        key = dataset_cache_key(
+            RAW_BW_DIR, settings=(DEFAULT_TOKEN_LENGTH, DEFAULT_OWN_SEGMENT_IDS)
+        )
+        assert (intermediate_dir / CACHE_KEY_FILE).read_text() == key
+        assert len(load_encoded_dataset(str(intermediate_dir))) == len(encoded_data)
+
+
+class TestArgParser(unittest.TestCase):
+    def test_model_choices(self):
+        arg_parser = _set_up_arg_parser()
+
+        # Model names are case-insensitive
+        parsed_args = arg_parser.parse_args(["TRAIN", "-i", "data", "-m", "vist"])
+        assert parsed_args.model == "VIST"
+
+        # Unknown models are rejected while parsing the arguments
+        with self.assertRaises(SystemExit):
+            arg_parser.parse_args(["EVALUATE", "-i", "data", "-l", "m", "-m", "foo"])
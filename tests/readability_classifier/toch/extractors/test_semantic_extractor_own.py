@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import torch
+
+from src.readability_classifier.toch.extractors import semantic_extractor_own
+from src.readability_classifier.toch.extractors.semantic_extractor_own import (
+    NL_TOKEN_ID,
+    OwnBertEmbedding,
+)
+from src.readability_classifier.utils.config import SemanticInput
+from tests.readability_classifier.utils.utils import DirTest
+
+TOKEN_LENGTH = 100
+BATCH_SIZE = 2
+SHAPE = (BATCH_SIZE, TOKEN_LENGTH)
+
+
+def create_test_data(device: torch.device) -> SemanticInput:
+    # Input ids with some [NL] tokens
+    input_ids = torch.randint(1, 28996, SHAPE).long()
+    input_ids[:, ::10] = NL_TOKEN_ID
+    segment_ids = torch.randint(0, 300, SHAPE).long()
+
+    return SemanticInput(
+        input_ids=input_ids.to(device),
+        token_type_ids=torch.zeros(SHAPE, dtype=torch.long, device=device),
+        attention_mask=torch.ones(SHAPE, dtype=torch.long, device=device),
+        segment_ids=segment_ids.to(device),
+    )
+
+
+class TestOwnBertEmbedding(DirTest):
+    def test_shared_bert_not_in_state_dict(self):
+        embedding = OwnBertEmbedding.build_from_config()
+        other_embedding = OwnBertEmbedding.build_from_config()
+
+        # The frozen Bert model is shared, but not part of the state dict
+        assert embedding.model is other_embedding.model
+        assert not any(key.startswith("model.") for key in embedding.state_dict())
+        assert "nl_token_embedding" in embedding.state_dict()
+
+    def test_reload_in_new_process(self):
+        embedding = OwnBertEmbedding.build_from_config().eval()
+        x = create_test_data(embedding.device)
+        with torch.no_grad():
+            expected = embedding(x)
+
+        # Store the checkpoint
+        checkpoint = Path(self.output_dir) / "embedding.pt"
+        torch.save(embedding.state_dict(), checkpoint)
+
+        # Reload it with a freshly loaded Bert model, as in a new process
+        semantic_extractor_own._BERT_CACHE.clear()
+        loaded_embedding = OwnBertEmbedding.build_from_config().eval()
+        loaded_embedding.load_state_dict(
+            torch.load(checkpoint, map_location=loaded_embedding.device)
+        )
+        with torch.no_grad():
+            actual = loaded_embedding(x)
+
+        assert torch.allclose(actual, expected)
+
+    def test_load_old_checkpoint(self):
+        embedding = OwnBertEmbedding.build_from_config()
+        other_embedding = OwnBertEmbedding.build_from_config()
+
+        # Checkpoints of older versions contain the Bert model with the [NL] embedding
+        bert_state = embedding.model.state_dict()
+        word_embeddings = bert_state["embeddings.word_embeddings.weight"].clone()
+        word_embeddings[NL_TOKEN_ID] = 1.0
+        old_state = {
+            key: value
+            for key, value in other_embedding.state_dict().items()
+            if key != "nl_token_embedding"
+        }
+        old_state.update(
+            {
+                f"model.{key}": torch.zeros_like(value)
+                for key, value in bert_state.items()
+            }
+        )
+        old_state["model.embeddings.word_embeddings.weight"] = word_embeddings
+
+        bert_weight = embedding.model.embeddings.word_embeddings.weight.clone()
+        embedding.load_state_dict(old_state)
+
+        # The [NL] embedding is loaded, the shared Bert model is left unchanged
+        assert torch.equal(
+            embedding.nl_token_embedding, torch.ones_like(embedding.nl_token_embedding)
+        )
+        assert torch.equal(
+            embedding.model.embeddings.word_embeddings.weight, bert_weight
+        )
+        assert torch.equal(
+            embedding.segment_embedding.weight,
+            other_embedding.segment_embedding.weight,
+        )
@@ -16,7 +16,7 @@ SHAPE = (BATCH_SIZE, HEIGHT, WIDTH)
 
 
 def create_test_data():
-    return StructuralInput(torch.randint(MIN, MAX, SHAPE).float())
+    return StructuralInput(torch.randint(MIN, MAX, SHAPE, dtype=torch.float32))
 
 
 class TestStructuralExtractor(unittest.TestCase):
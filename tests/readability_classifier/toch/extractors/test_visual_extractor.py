@@ -16,7 +16,7 @@ SHAPE = (BATCH_SIZE, CHANNELS, IMG_WIDTH, IMG_HEIGHT)
 
 
 def create_test_data():
-    return VisualInput(torch.randint(RGB_MIN, RGB_MAX, SHAPE).float())
+    return VisualInput(torch.randint(RGB_MIN, RGB_MAX, SHAPE, dtype=torch.float32))
 
 
 class TestVisualExtractor(unittest.TestCase):
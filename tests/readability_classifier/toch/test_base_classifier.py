@@ -1,6 +1,20 @@
+import json
 import os
 import unittest
+from dataclasses import fields
+from pathlib import Path
 
+import numpy as np
+import torch
+
+from src.readability_classifier.toch.base_classifier import (
+    EvaluationStats,
+    KFoldStats,
+)
+from src.readability_classifier.toch.models.structural_classifier import (
+    StructuralClassifier,
+)
+from src.readability_classifier.toch.models.structural_model import StructuralModel
 from src.readability_classifier.toch.towards_classifier import TowardsClassifier
 from tests.readability_classifier.utils.utils import DirTest
 
@@ -26,3 +40,152 @@ class TestTowardsClassifier(DirTest):
 
         # Check if the model was stored successfully
         assert os.path.exists(os.path.join(self.output_dir, "model.pt"))
+
+
+class TestStoreLoad(DirTest):
+    def test_store_load_round_trip(self):
+        classifier = StructuralClassifier(store_dir=Path(self.output_dir))
+        model_path = Path(self.output_dir) / "model.pt"
+
+        # Store the model
+        classifier.store(str(model_path))
+        classifier.wait_for_pending_stores()
+        assert model_path.exists()
+
+        # Load it with the memory-mapped, weights only loaders
+        expected_state = classifier._raw_model.state_dict()
+        loaded_model = StructuralModel.load_from_checkpoint(model_path)
+        loaded_classifier = StructuralClassifier(store_dir=Path(self.output_dir))
+        loaded_classifier.load(str(model_path))
+
+        for state in (
+            loaded_model.state_dict(),
+            loaded_classifier._raw_model.state_dict(),
+        ):
+            assert state.keys() == expected_state.keys()
+            for key, value in expected_state.items():
+                assert torch.equal(state[key].cpu(), value.cpu())
+
+    def test_store_raises_write_errors(self):
+        classifier = StructuralClassifier(store_dir=Path(self.output_dir))
+        model_path = Path(self.output_dir) / "missing_dir" / "model.pt"
+
+        # The write fails, because the directory does not exist
+        with self.assertRaises(OSError):
+            classifier.store(str(model_path))
+
+
+def _failing_backend(graph_module, example_inputs):
+    raise RuntimeError("Compiler not available")
+
+
+class TestCompileFallback(unittest.TestCase):
+    def test_forward_falls_back_to_eager(self):
+        classifier = StructuralClassifier()
+        raw_model = torch.nn.Linear(2, 1)
+        classifier._raw_model = raw_model
+        classifier.model = torch.compile(raw_model, backend=_failing_backend)
+        x = torch.ones(1, 2)
+
+        # The failed compilation is logged and the model runs in eager mode
+        with self.assertLogs(level="WARNING"):
+            output = classifier._forward(x)
+
+        assert classifier.model is raw_model
+        assert torch.equal(output, raw_model(x))
+
+
+class TestResetModel(unittest.TestCase):
+    def test_reset_model(self):
+        classifier = StructuralClassifier()
+        model = classifier._raw_model
+
+        # Adapt the input length of the first dense layer, as done for the inputs
+        model.fc_model.update_input_length(10, classifier.device)
+        old_state = {key: value.clone() for key, value in model.state_dict().items()}
+
+        classifier._reset_model()
+
+        # The parameters are reinitialized in place, the resized layer keeps its size
+        new_state = model.state_dict()
+        assert classifier._raw_model is model
+        assert new_state.keys() == old_state.keys()
+        assert model.fc_model.dense1.in_features == 10
+        for key, value in model.named_parameters():
+            assert not torch.equal(value.detach(), old_state[key]), key
+
+
+class TestPredict(unittest.TestCase):
+    classifier = StructuralClassifier()
+    code = """
+    public void getNumber(){
+        int count = 0;
+        while(count < 10){
+            count++;
+        }
+    }
+    """
+
+    def test_predict_single(self):
+        prediction = self.classifier.predict(self.code)
+
+        assert isinstance(prediction, float)
+        assert 0.0 <= prediction <= 1.0
+
+    def test_predict_batch(self):
+        encoder = self.classifier._encoder
+
+        predictions = self.classifier.predict([self.code, self.code, "int x = 1;"])
+
+        # One float per snippet, in order (same snippet, same prediction)
+        assert isinstance(predictions, list)
+        assert len(predictions) == 3
+        assert all(isinstance(prediction, float) for prediction in predictions)
+        self.assertAlmostEqual(predictions[0], predictions[1], places=5)
+        self.assertAlmostEqual(predictions[0], self.classifier.predict(self.code), 5)
+
+        # The encoder is created once and reused
+        assert self.classifier._encoder is encoder
+
+    def test_predict_empty(self):
+        assert self.classifier.predict([]) == []
+
+
+class TestStats(unittest.TestCase):
+    def test_k_fold_stats_to_json(self):
+        fold_stats = [
+            EvaluationStats(
+                accuracy=0.5, precision=0.5, recall=0.5, f1=0.5, auc=0.5, mcc=0.0
+            ),
+            EvaluationStats(
+                accuracy=np.float64(1.0),
+                precision=1.0,
+                recall=1.0,
+                f1=1.0,
+                auc=float("nan"),
+                mcc=1.0,
+            ),
+        ]
+
+        k_fold_stats = KFoldStats(fold_stats)
+        stats_json = k_fold_stats.to_json()
+        stats = json.loads(stats_json)
+
+        # The stats are only stored in the fields, which are serialized in order
+        assert set(vars(k_fold_stats)) == {field.name for field in fields(KFoldStats)}
+        assert list(stats) == [field.name for field in fields(KFoldStats)]
+        assert k_fold_stats.mean_accuracy == 0.75
+
+        # Written with an indent of 2, NaN is written as null
+        assert stats_json.startswith('{\n  "max_accuracy": 1.0,')
+        assert stats["mean_accuracy"] == 0.75
+        assert stats["std_accuracy"] == 0.25
+        assert stats["mean_auc"] is None
+        assert stats["fold_stats"][1] == {
+            "accuracy": 1.0,
+            "precision": 1.0,
+            "recall": 1.0,
+            "f1": 1.0,
+            "auc": None,
+            "mcc": 1.0,
+        }
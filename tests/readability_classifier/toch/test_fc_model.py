@@ -0,0 +1,29 @@
+import unittest
+
+import torch
+
+from src.readability_classifier.toch.fc_model import FullyConnectedModel
+from src.readability_classifier.utils.config import BaseModelConfig
+
+
+class TestFullyConnectedModel(unittest.TestCase):
+    fc_model = FullyConnectedModel(
+        BaseModelConfig(input_length=8, output_length=1, dropout=0.0)
+    )
+
+    def test_forward_pass_under_autocast(self):
+        # Large logits saturate the sigmoid to 1.0 in bf16, but not in fp32
+        self.fc_model.eval()
+        with torch.no_grad():
+            self.fc_model.dense3.weight.fill_(0.0)
+            self.fc_model.dense3.bias.fill_(8.0)
+
+        x = torch.rand(4, 8)
+        with torch.inference_mode(), torch.autocast(
+            device_type="cpu", dtype=torch.bfloat16
+        ):
+            output = self.fc_model(x)
+
+        assert output.shape == (4, 1)
+        assert output.dtype == torch.float32
+        assert (output < 1.0).all()